@@ -0,0 +1,2369 @@
+import serial
+import time
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sqlite3
+import sys
+import threading
+from collections import Counter, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import lru_cache
+
+# ================= CONFIGURATION =================
+PORT = "COM5"          # CHANGE THIS to your Enhanced COM port
+BAUDRATE = 38400       # Match Menu 031 CAT RATE
+TIMEOUT = 1.0
+CMD_TIMEOUT = 0.5      # Per-command reply timeout (sec)
+CMD_RETRIES = 1        # Re-send a command this many times if no reply
+CAT_RATES = (38400, 19200, 9600, 4800)  # Menu 031 CAT RATE choices, tried on connect
+PROBE_PINGS = 3        # Pings used to measure round-trip latency
+MIN_CMD_TIMEOUT = 0.05 # Floor for the per-session timeout picked from the probe
+PIPELINE_WINDOW = 8    # EX requests sent back to back before reading replies
+PIPELINE_MAX_WINDOW = 32
+PIPELINE_PASSES = 3    # Re-query passes for menus whose replies were dropped
+LINK_MENUS = ('031', '032', '033')  # CAT RATE/TOT/RTS: changing these drops the link
+MENU_COUNT = 153
+FLEET_WORKERS = 8      # Max radios dumped at the same time
+SNAPSHOT_DIR = "snapshots"  # Last dump of each radio, for incremental dumps
+SNAPSHOT_MAX_AGE = 12 * 3600  # Incremental dumps re-read snapshot values older than this (sec)
+ARCHIVE_DB = "ft991a_archive.db"  # SQLite store of ingested nightly dumps
+OUTLIER_SHARE = 0.25       # A minority fleet value held by at most this share of radios is an outlier
+LOG_LEVEL = logging.INFO    # GUI log level; DEBUG also shows per-menu queries
+LOG_MAX_LINES = 2000        # Older GUI log lines are trimmed past this
+LOG_DRAIN_MS = 100          # How often the GUI flushes queued log lines
+SCHEDULER_CHUNK = 16        # EX menus per scheduled job; status polls can run between jobs
+PRIORITY_STATUS = 0         # Command scheduler priorities (lower runs first)
+PRIORITY_BULK = 10
+AI_POLL_INTERVAL = 0.05     # Idle scheduler checks for auto-information frames this often
+AI_FRAME_MAX = 28           # Longest auto-information frame (IF), in characters
+TXT_OUTPUT = "ft991a_menu_dump.txt"
+CSV_OUTPUT = "ft991a_menu_dump.csv"
+JSONL_OUTPUT = "ft991a_menu_dump.jsonl"
+
+# ================= Menu Mapping (from FT-991A Manual) =================
+# Expanded from previous; add/edit as needed from manual
+MENU_MAP = {
+    '001': {'name': 'AGC FAST DELAY', 'description': 'AGC-FAST decay time', 'default': '300', 'unit': 'msec'},
+    '002': {'name': 'AGC MID DELAY', 'description': 'AGC-MID decay time', 'default': '700', 'unit': 'msec'},
+    '003': {'name': 'AGC SLOW DELAY', 'description': 'AGC-SLOW decay time', 'default': '3000', 'unit': 'msec'},
+    '004': {'name': 'HOME FUNCTION', 'description': 'HOME screen display', 'default': '0', 'value_map': {'0': 'SCOPE', '1': 'FUNCTION'}},
+    '005': {'name': 'MY CALL INDICATION', 'description': 'MY CALL display duration', 'default': '1', 'unit': 'sec', 'value_map': {'0': 'OFF'}},
+    '006': {'name': 'DISPLAY COLOR', 'description': 'VFO-A frequency field color', 'default': '0', 'value_map': {'0': 'BLUE', '1': 'GRAY', '2': 'GREEN', '3': 'ORANGE', '4': 'PURPLE', '5': 'RED', '6': 'SKY BLUE'}},
+    '007': {'name': 'DIMMER LED', 'description': 'Key LED brightness', 'default': '2'},
+    '008': {'name': 'DIMMER TFT', 'description': 'TFT display brightness', 'default': '8'},
+    '009': {'name': 'BAR MTR PEAK HOLD', 'description': 'Bar meter peak hold time', 'default': '0', 'value_map': {'0': 'OFF', '1': '0.5', '2': '1.0', '3': '2.0'}},
+    '010': {'name': 'DVS RX OUT LEVEL', 'description': 'Voice memory monitoring level', 'default': '050'},
+    '011': {'name': 'DVS TX OUT LEVEL', 'description': 'Mic output level for voice memory', 'default': '050'},
+# ... (keep all previous entries from your last version; truncated here for brevity)
+    '012': {'name': 'KEYER TYPE', 'description': 'Keyer mode', 'default': '3', 'value_map': {'0': 'OFF', '1': 'BUG', '2': 'ELEKEY-A', '3': 'ELEKEY-B', '4': 'ELEKEY-Y', '5': 'ACS'}},
+    '013': {'name': 'KEYER DOT/DASH', 'description': 'Reverse CW paddle connections', 'default': '0', 'value_map': {'0': 'NOR', '1': 'REV'}},
+    '014': {'name': 'CW WEIGHT', 'description': 'CW keying weight', 'default': '32', 'value_map': None},  # Raw is like '32' for 3.2
+    '015': {'name': 'BEACON INTERVAL', 'description': 'Beacon repeat interval', 'default': '000', 'unit': 'sec', 'value_map': {'000': 'OFF'}},
+    '016': {'name': 'NUMBER STYLE', 'description': 'Contest number format', 'default': '0', 'value_map': {'0': '1290', '1': 'AUNO', '2': 'AUNT', '3': 'A2NO', '4': 'A2NT', '5': '12NO', '6': '12NT'}},
+    '017': {'name': 'CONTEST NUMBER', 'description': 'Contest number (Morse)', 'default': '0001', 'value_map': None},
+    '018': {'name': 'CW MEMORY 1', 'description': 'Memory entry method', 'default': '1', 'value_map': {'0': 'TEXT', '1': 'MESSAGE'}},
+    '019': {'name': 'CW MEMORY 2', 'description': 'Memory entry method', 'default': '1', 'value_map': {'0': 'TEXT', '1': 'MESSAGE'}},
+    '020': {'name': 'CW MEMORY 3', 'description': 'Memory entry method', 'default': '1', 'value_map': {'0': 'TEXT', '1': 'MESSAGE'}},
+    '021': {'name': 'CW MEMORY 4', 'description': 'Memory entry method', 'default': '1', 'value_map': {'0': 'TEXT', '1': 'MESSAGE'}},
+    '022': {'name': 'CW MEMORY 5', 'description': 'Memory entry method', 'default': '1', 'value_map': {'0': 'TEXT', '1': 'MESSAGE'}},
+    '023': {'name': 'NB WIDTH', 'description': 'NB pulse duration', 'default': '2', 'value_map': {'0': '1 msec', '1': '3 msec', '2': '10 msec'}},
+    '024': {'name': 'NB REJECTION', 'description': 'Noise attenuation level', 'default': '1', 'value_map': {'0': '10 dB', '1': '30 dB', '2': '50 dB'}},
+    '025': {'name': 'NB LEVEL', 'description': 'NB strength', 'default': '02', 'value_map': None},
+    '026': {'name': 'BEEP LEVEL', 'description': 'Beep volume', 'default': '050', 'value_map': None},
+    '027': {'name': 'TIME ZONE', 'description': 'UTC offset', 'default': '000', 'value_map': None},  # e.g., '-0700' = -07:00
+    '028': {'name': 'GPS/232C SELECT', 'description': 'GPS/CAT jack function', 'default': '3', 'value_map': {'0': 'GPS1', '1': 'GPS2', '2': 'RS232C'}},
+    '029': {'name': '232C RATE', 'description': 'RS-232C baud rate', 'default': '0', 'value_map': {'0': '4800', '1': '9600', '2': '19200', '3': '38400'}},
+    '030': {'name': '232C TOT', 'description': 'RS-232C timeout', 'default': '0', 'value_map': {'0': '10 msec', '1': '100 msec', '2': '1000 msec', '3': '3000 msec'}},
+    '031': {'name': 'CAT RATE', 'description': 'CAT baud rate', 'default': '3', 'value_map': {'0': '4800', '1': '9600', '2': '19200', '3': '38400'}},
+    '032': {'name': 'CAT TOT', 'description': 'CAT timeout', 'default': '2', 'value_map': {'0': '10 msec', '1': '100 msec', '2': '1000 msec', '3': '3000 msec'}},
+    '033': {'name': 'CAT RTS', 'description': 'CAT RTS flow control', 'default': '1', 'value_map': {'0': 'DISABLE', '1': 'ENABLE'}},
+    '034': {'name': 'MEM GROUP', 'description': 'Memory group function', 'default': '0', 'value_map': {'0': 'DISABLE', '1': 'ENABLE'}},
+    '035': {'name': 'QUICK SPLIT FREQ', 'description': 'Offset for Quick Split', 'default': '+05', 'unit': 'kHz', 'value_map': None},
+    '036': {'name': 'TX TOT', 'description': 'Transmit timeout', 'default': '00', 'unit': 'min', 'value_map': {'00': 'OFF'}},
+    '037': {'name': 'MIC SCAN', 'description': 'Mic auto-scan', 'default': '1', 'value_map': {'0': 'DISABLE', '1': 'ENABLE'}},
+    '038': {'name': 'MIC SCAN RESUME', 'description': 'Scan resume mode', 'default': '1', 'value_map': {'0': 'PAUSE', '1': 'TIME'}},
+    '039': {'name': 'REF FREQ ADJ', 'description': 'Reference oscillator adjustment', 'default': '+00', 'value_map': None},
+    '040': {'name': 'CLAR MODE SELECT', 'description': 'Clarifier mode', 'default': '0', 'value_map': {'0': 'RX', '1': 'TX', '2': 'TRX'}},
+    '041': {'name': 'AM LCUT FREQ', 'description': 'AM low-cut filter frequency', 'default': '00', 'value_map': {'00': 'OFF'}},
+    '042': {'name': 'AM LCUT SLOPE', 'description': 'AM low-cut slope', 'default': '0', 'value_map': {'0': '6 dB/oct', '1': '18 dB/oct'}},
+    '043': {'name': 'AM HCUT FREQ', 'description': 'AM high-cut filter frequency', 'default': '00', 'value_map': {'00': 'OFF'}},
+    '044': {'name': 'AM HCUT SLOPE', 'description': 'AM high-cut slope', 'default': '0', 'value_map': {'0': '6 dB/oct', '1': '18 dB/oct'}},
+    '045': {'name': 'AM MIC SELECT', 'description': 'AM mic input', 'default': '0', 'value_map': {'0': 'MIC', '1': 'REAR'}},
+    '046': {'name': 'AM OUT LEVEL', 'description': 'AM audio output level', 'default': '050', 'value_map': None},
+    '047': {'name': 'AM PTT SELECT', 'description': 'AM PTT control', 'default': '2', 'value_map': {'0': 'DAKY', '1': 'RTS', '2': 'DTR'}},
+    '048': {'name': 'AM PORT SELECT', 'description': 'AM input port', 'default': '1', 'value_map': {'0': 'DATA', '1': 'USB'}},
+    '049': {'name': 'AM DATA GAIN', 'description': 'AM input gain (REAR)', 'default': '050', 'value_map': None},
+    '050': {'name': 'CW LCUT FREQ', 'description': 'CW low-cut filter frequency', 'default': '04', 'value_map': {'00': 'OFF'}},  # 04 = 250 Hz (50 Hz/step)
+    '051': {'name': 'CW LCUT SLOPE', 'description': 'CW low-cut slope', 'default': '1', 'value_map': {'0': '6 dB/oct', '1': '18 dB/oct'}},
+    '052': {'name': 'CW HCUT FREQ', 'description': 'CW high-cut filter frequency', 'default': '11', 'value_map': {'67': 'OFF'}},
+    '053': {'name': 'CW HCUT SLOPE', 'description': 'CW high-cut slope', 'default': '1', 'value_map': {'0': '6 dB/oct', '1': '18 dB/oct'}},
+    '054': {'name': 'CW OUT LEVEL', 'description': 'CW output level', 'default': '050', 'value_map': None},
+    '055': {'name': 'CW AUTO MODE', 'description': 'CW keying on SSB', 'default': '0', 'value_map': {'0': 'OFF', '1': '50M', '2': 'ON'}},
+    '056': {'name': 'CW BK-IN TYPE', 'description': 'CW break-in mode', 'default': '1', 'value_map': {'0': 'SEMI', '1': 'FULL'}},
+    '057': {'name': 'CW BK-IN DELAY', 'description': 'CW delay time', 'default': '0140', 'unit': 'msec', 'value_map': None},
+    '058': {'name': 'CW WAVE SHAPE', 'description': 'CW rise/fall time', 'default': '2', 'value_map': {'0': '2 msec', '1': '4 msec'}},
+    '059': {'name': 'CW FREQ DISPLAY', 'description': 'Pitch display mode', 'default': '0', 'value_map': {'0': 'DIRECT FREQ', '1': 'PITCH OFFSET'}},
+    '060': {'name': 'PC KEYING', 'description': 'Keying method for RTTY/DATA', 'default': '0', 'value_map': {'0': 'OFF', '1': 'DAKY', '2': 'RTS', '3': 'DTR'}},
+    '061': {'name': 'QSK DELAY TIME', 'description': 'Key-up delay for QSK', 'default': '0', 'value_map': {'0': '15 msec', '1': '20 msec', '2': '25 msec', '3': '30 msec'}},
+    '062': {'name': 'DATA MODE', 'description': 'Data scheme', 'default': '1', 'value_map': {'0': 'PSK', '1': 'OTHERS'}},
+    '063': {'name': 'PSK TONE', 'description': 'PSK tone frequency', 'default': '1', 'value_map': {'0': '1000 Hz', '1': '1500 Hz', '2': '2000 Hz'}},
+    '064': {'name': 'OTHER DISP (SSB)', 'description': 'Displayed offset in DATA mode', 'default': '+1500', 'unit': 'Hz'},
+    '065': {'name': 'OTHER SHIFT (SSB)', 'description': 'Carrier point in DATA mode', 'default': '+1500', 'unit': 'Hz'},
+    '066': {'name': 'DATA LCUT FREQ', 'description': 'DATA low-cut filter frequency', 'default': '00', 'value_map': {'00': 'OFF'}},
+    '067': {'name': 'DATA LCUT SLOPE', 'description': 'DATA low-cut slope', 'default': '0', 'value_map': {'0': '6 dB/oct', '1': '18 dB/oct'}},
+    '068': {'name': 'DATA HCUT FREQ', 'description': 'DATA high-cut filter frequency', 'default': '00', 'value_map': {'00': 'OFF'}},
+    '069': {'name': 'DATA HCUT SLOPE', 'description': 'DATA high-cut slope', 'default': '0', 'value_map': {'0': '6 dB/oct', '1': '18 dB/oct'}},
+    '070': {'name': 'DATA IN SELECT', 'description': 'DATA input jack', 'default': '1', 'value_map': {'0': 'REAR', '1': 'MIC'}},
+    '071': {'name': 'DATA PTT SELECT', 'description': 'PTT control for data', 'default': '2', 'value_map': {'0': 'DAKY', '1': 'RTS', '2': 'DTR'}},
+    '072': {'name': 'DATA PORT SELECT', 'description': 'Data input port', 'default': '1', 'value_map': {'0': 'DATA', '1': 'USB'}},
+    '073': {'name': 'DATA OUT LEVEL', 'description': 'Data I/O level', 'default': '050', 'value_map': None},
+    '074': {'name': 'FM MIC SELECT', 'description': 'FM mic input', 'default': '0', 'value_map': {'0': 'MIC', '1': 'REAR'}},
+    '075': {'name': 'FM OUT LEVEL', 'description': 'FM audio output level', 'default': '050', 'value_map': None},
+    '076': {'name': 'FM PKT PTT SELECT', 'description': 'PTT for FM packet', 'default': '1', 'value_map': {'0': 'DAKY', '1': 'RTS', '2': 'DTR'}},
+    '077': {'name': 'FM PKT PORT SELECT', 'description': 'FM packet input port', 'default': '1', 'value_map': {'0': 'DATA', '1': 'USB'}},
+    '078': {'name': 'FM PKT TX GAIN', 'description': 'FM packet TX gain', 'default': '050', 'value_map': None},
+    '079': {'name': 'FM PKT MODE', 'description': 'FM packet baud rate', 'default': '0', 'value_map': {'0': '1200', '1': '9600'}},
+    '080': {'name': 'RPT SHIFT 28MHz', 'description': 'Repeater offset for 28 MHz', 'default': '0100', 'unit': 'kHz', 'value_map': None},
+    '081': {'name': 'RPT SHIFT 50MHz', 'description': 'Repeater offset for 50 MHz', 'default': '0500', 'unit': 'kHz', 'value_map': None},
+    '082': {'name': 'RPT SHIFT 144MHz', 'description': 'Repeater offset for 144 MHz', 'default': '4000', 'unit': 'kHz', 'value_map': None},
+    '083': {'name': 'RPT SHIFT 430MHz', 'description': 'Repeater offset for 430 MHz', 'default': '05000', 'unit': 'kHz', 'value_map': None},
+    '084': {'name': 'ARS 144MHz', 'description': 'Automatic Repeater Shift on 144 MHz', 'default': '0', 'value_map': {'0': 'OFF', '1': 'ON'}},
+    '085': {'name': 'ARS 430MHz', 'description': 'Automatic Repeater Shift on 430 MHz', 'default': '1', 'value_map': {'0': 'OFF', '1': 'ON'}},
+    '086': {'name': 'DCS POLARITY', 'description': 'DCS code polarity', 'default': '0', 'value_map': {'0': 'Tn-Rn', '1': 'Tn-Riv', '2': 'Tiv-Rn', '3': 'Tiv-Riv'}},
+    '087': {'name': 'RADIO ID', 'description': 'Unique transceiver ID (read-only)', 'default': 'G0lYb', 'value_map': None},
+    '088': {'name': 'GM DISPLAY', 'description': 'Group members sort mode', 'default': '0', 'value_map': {'0': 'DISTANCE', '1': 'STRENGTH'}},
+    '089': {'name': 'DISTANCE', 'description': 'Distance unit for GM', 'default': '1', 'value_map': {'0': 'km', '1': 'mile'}},
+    '090': {'name': 'AMS TX MODE', 'description': 'AMS transmission behavior', 'default': '0', 'value_map': {'0': 'AUTO', '1': 'MANUAL', '2': 'DN', '3': 'VW', '4': 'ANALOG'}},
+    '091': {'name': 'STANDBY BEEP', 'description': 'Beep when digital contact ends', 'default': '1', 'value_map': {'0': 'OFF', '1': 'ON'}},
+    '092': {'name': 'RTTY LCUT FREQ', 'description': 'RTTY low-cut filter frequency', 'default': '05', 'value_map': {'00': 'OFF'}},
+    '093': {'name': 'RTTY LCUT SLOPE', 'description': 'RTTY low-cut slope', 'default': '1', 'value_map': {'0': '6 dB/oct', '1': '18 dB/oct'}},
+    '094': {'name': 'RTTY HCUT FREQ', 'description': 'RTTY high-cut filter frequency', 'default': '47', 'value_map': {'67': 'OFF'}},
+    '095': {'name': 'RTTY HCUT SLOPE', 'description': 'RTTY high-cut slope', 'default': '1', 'value_map': {'0': '6 dB/oct', '1': '18 dB/oct'}},
+    '096': {'name': 'RTTY SHIFT PORT', 'description': 'Input jack for RTTY shift', 'default': '1', 'value_map': {'0': 'SHIFT', '1': 'DTR', '2': 'RTS'}},
+    '097': {'name': 'RTTY POLARITY-RX', 'description': 'RTTY receive shift direction', 'default': '0', 'value_map': {'0': 'NOR', '1': 'REV'}},
+    '098': {'name': 'RTTY POLARITY-TX', 'description': 'RTTY transmit shift direction', 'default': '0', 'value_map': {'0': 'NOR', '1': 'REV'}},
+    '099': {'name': 'RTTY OUT LEVEL', 'description': 'Data output level in RTTY', 'default': '050', 'value_map': None},
+    '100': {'name': 'RTTY SHIFT FREQ', 'description': 'RTTY frequency shift width', 'default': '0', 'value_map': {'0': '170 Hz', '1': '200 Hz', '2': '425 Hz', '3': '850 Hz'}},
+    '101': {'name': 'RTTY MARK FREQ', 'description': 'RTTY mark frequency', 'default': '1', 'value_map': {'0': '1275 Hz', '1': '2125 Hz'}},
+    '102': {'name': 'SSB LCUT FREQ', 'description': 'SSB low-cut filter frequency', 'default': '01', 'value_map': {'00': 'OFF'}},
+    '103': {'name': 'SSB LCUT SLOPE', 'description': 'SSB low-cut slope', 'default': '0', 'value_map': {'0': '6 dB/oct', '1': '18 dB/oct'}},
+    '104': {'name': 'SSB HCUT FREQ', 'description': 'SSB high-cut filter frequency', 'default': '67', 'value_map': {'67': 'OFF'}},
+    '105': {'name': 'SSB HCUT SLOPE', 'description': 'SSB high-cut slope', 'default': '0', 'value_map': {'0': '6 dB/oct', '1': '18 dB/oct'}},
+    '106': {'name': 'SSB MIC SELECT', 'description': 'SSB mic input', 'default': '0', 'value_map': {'0': 'MIC', '1': 'REAR'}},
+    '107': {'name': 'SSB OUT LEVEL', 'description': 'SSB audio output level', 'default': '050', 'value_map': None},
+    '108': {'name': 'SSB PTT SELECT', 'description': 'SSB PTT control', 'default': '2', 'value_map': {'0': 'DAKY', '1': 'RTS', '2': 'DTR'}},
+    '109': {'name': 'SSB PORT SELECT', 'description': 'SSB input port', 'default': '1', 'value_map': {'0': 'DATA', '1': 'USB'}},
+    '110': {'name': 'SSB TX BPF', 'description': 'DSP bandpass filter for SSB TX', 'default': '3', 'value_map': {'0': '100-3000 Hz', '1': '100-2900 Hz', '2': '200-2800 Hz', '3': '300-2700 Hz', '4': '400-2600 Hz'}},
+    '111': {'name': 'APF WIDTH', 'description': 'Audio peak filter bandwidth in CW', 'default': '1', 'value_map': {'0': 'NARROW', '1': 'MEDIUM', '2': 'WIDE'}},
+    '112': {'name': 'CONTOUR LEVEL', 'description': 'Gain of audio contour circuit', 'default': '-15', 'value_map': None},
+    '113': {'name': 'CONTOUR WIDTH', 'description': 'Bandwidth (Q) of contour circuit', 'default': '10', 'value_map': None},
+    '114': {'name': 'IF NOTCH WIDTH', 'description': 'Bandwidth of DSP IF notch filter', 'default': '1', 'value_map': {'0': 'NARROW', '1': 'WIDE'}},
+    '115': {'name': 'SCP DISPLAY MODE', 'description': 'Scope display type', 'default': '1', 'value_map': {'0': 'SPECTRUM', '1': 'WATER FALL'}},
+    '116': {'name': 'SCP SPAN FREQ', 'description': 'Frequency span of spectrum scope', 'default': '03', 'value_map': {'0': '50 kHz', '1': '100 kHz', '2': '200 kHz', '3': '500 kHz', '4': '1000 kHz'}},
+    '117': {'name': 'SPECTRUM COLOR', 'description': 'Color for spectrum scope', 'default': '2', 'value_map': {'0': 'BLUE', '1': 'GRAY', '2': 'GREEN', '3': 'ORANGE', '4': 'PURPLE', '5': 'RED', '6': 'SKY BLUE'}},
+    '118': {'name': 'WATER FALL COLOR', 'description': 'Color for waterfall display', 'default': '7', 'value_map': {'0': 'BLUE', '1': 'GRAY', '2': 'GREEN', '3': 'ORANGE', '4': 'PURPLE', '5': 'RED', '6': 'SKY BLUE', '7': 'MULTI'}},
+    '119': {'name': 'PRMTRC EQ1 FREQ', 'description': 'Center frequency for low band parametric mic EQ', 'default': '05', 'value_map': {'00': 'OFF'}},
+    '120': {'name': 'PRMTRC EQ1 LEVEL', 'description': 'Gain for low band parametric mic EQ', 'default': '+09', 'unit': 'dB', 'value_map': None},
+    '121': {'name': 'PRMTRC EQ1 BWTH', 'description': 'Bandwidth for low band parametric mic EQ', 'default': '08', 'value_map': None},
+    '122': {'name': 'PRMTRC EQ2 FREQ', 'description': 'Center frequency for mid band parametric mic EQ', 'default': '04', 'value_map': {'00': 'OFF'}},
+    '123': {'name': 'PRMTRC EQ2 LEVEL', 'description': 'Gain for mid band parametric mic EQ', 'default': '+07', 'unit': 'dB', 'value_map': None},
+    '124': {'name': 'PRMTRC EQ2 BWTH', 'description': 'Bandwidth for mid band parametric mic EQ', 'default': '08', 'value_map': None},  # From patterns in manual
+    '125': {'name': 'PRMTRC EQ3 FREQ', 'description': 'Center frequency for high band parametric mic EQ', 'default': '08', 'value_map': {'00': 'OFF'}},
+    '126': {'name': 'PRMTRC EQ3 LEVEL', 'description': 'Gain for high band parametric mic EQ', 'default': '+05', 'unit': 'dB', 'value_map': None},
+    '127': {'name': 'PRMTRC EQ3 BWTH', 'description': 'Bandwidth for high band parametric mic EQ', 'default': '04', 'value_map': None},
+    '128': {'name': 'P PRMTRC EQ1 FREQ', 'description': 'Center frequency for low band parametric EQ (processor)', 'default': '01', 'value_map': {'00': 'OFF'}},
+    '129': {'name': 'P PRMTRC EQ1 LEVEL', 'description': 'Gain for low band parametric EQ (processor)', 'default': '+10', 'unit': 'dB', 'value_map': None},
+    '130': {'name': 'P PRMTRC EQ1 BWTH', 'description': 'Bandwidth for low band parametric EQ (processor)', 'default': '03', 'value_map': None},
+    '131': {'name': 'P PRMTRC EQ2 FREQ', 'description': 'Center frequency for mid band parametric EQ (processor)', 'default': '01', 'value_map': {'00': 'OFF'}},
+    '132': {'name': 'P PRMTRC EQ2 LEVEL', 'description': 'Gain for mid band parametric EQ (processor)', 'default': '-03', 'unit': 'dB', 'value_map': None},
+    '133': {'name': 'P PRMTRC EQ2 BWTH', 'description': 'Bandwidth for mid band parametric EQ (processor)', 'default': '07', 'value_map': None},
+    '134': {'name': 'P PRMTRC EQ3 FREQ', 'description': 'Center frequency for high band parametric EQ (processor)', 'default': '18', 'value_map': {'00': 'OFF'}},
+    '135': {'name': 'P PRMTRC EQ3 LEVEL', 'description': 'Gain for high band parametric EQ (processor)', 'default': '+10', 'unit': 'dB', 'value_map': None},
+    '136': {'name': 'P PRMTRC EQ3 BWTH', 'description': 'Bandwidth for high band parametric EQ (processor)', 'default': '02', 'value_map': None},
+    '137': {'name': 'SPEECH PROC LEVEL', 'description': 'Speech processor level', 'default': '100', 'value_map': None},
+    '138': {'name': 'RF POWER SETTING', 'description': 'RF power output', 'default': '100', 'unit': 'W', 'value_map': None},
+    '139': {'name': 'MIC GAIN', 'description': 'Microphone gain', 'default': '050', 'value_map': None},
+    '140': {'name': 'PROC LEVEL', 'description': 'Processor level', 'default': '050', 'value_map': None},
+    '141': {'name': 'MONITOR SELECT', 'description': 'Monitor select', 'default': '2', 'value_map': None},
+    '142': {'name': 'MONITOR LEVEL', 'description': 'Monitor level', 'default': '1', 'value_map': None},
+    '143': {'name': 'VOX SELECT', 'description': 'VOX input select', 'default': '010', 'value_map': {'0': 'MIC', '1': 'DATA'}},
+    '144': {'name': 'VOX GAIN', 'description': 'VOX gain', 'default': '0500', 'value_map': None},
+    '145': {'name': 'VOX DELAY', 'description': 'VOX delay time', 'default': '050', 'unit': 'msec', 'value_map': None},
+    '146': {'name': 'ANTI VOX GAIN', 'description': 'Anti-VOX gain', 'default': '050', 'value_map': None},
+    '147': {'name': 'DATA VOX GAIN', 'description': 'Data VOX gain', 'default': '0100', 'value_map': None},
+    '148': {'name': 'DATA VOX DELAY', 'description': 'Data VOX delay', 'default': '000', 'unit': 'msec', 'value_map': None},
+    '149': {'name': 'ANTI DVOX GAIN', 'description': 'Anti-Data VOX gain', 'default': '0', 'value_map': None},
+    '150': {'name': 'PRT/WIRES FREQ', 'description': 'WIRES-X frequency setting method', 'default': '0', 'value_map': {'0': 'MANUAL', '1': 'PRESET'}},
+    '151': {'name': 'PRESET FREQUENCY', 'description': 'Preset WIRES-X frequency', 'default': '14655000', 'unit': 'Hz', 'value_map': None},
+    '152': {'name': 'SEARCH SETUP', 'description': 'WIRES-X search mode', 'default': '0', 'value_map': {'0': 'HISTORY', '1': 'ACTIVITY'}},
+    '153': {'name': 'WIRES DG-ID', 'description': 'WIRES-X Digital Group ID', 'default': '000', 'value_map': {'000': 'AUTO'}},
+    '154': {'name': 'Unknown/Reserved', 'description': 'Possibly reserved or undocumented', 'default': '???', 'value_map': None},  # No info; shows raw
+    # Add remaining from your dump/manual as needed
+}
+
+# ================= Compiled Menu Table =================
+# MENU_MAP compiled once into MenuEntry records indexed by menu number.
+# Results are tuples in CSV column order, cached per (menu, raw value), so
+# decoding archived dumps is mostly one list index and one dict lookup.
+MenuResult = namedtuple('MenuResult', ['menu', 'raw', 'name', 'translated', 'default', 'desc'])
+UNKNOWN_MENU = {'name': 'Unknown', 'description': '', 'default': 'N/A'}
+MENU_CACHE_SIZE = 256  # Cached results per menu (bounds garbled/odd values)
+
+class MenuEntry:
+    __slots__ = ('menu', 'name', 'desc', 'default', 'suffix', 'value_map', 'results')
+
+    def __init__(self, menu, info):
+        self.menu = menu
+        self.name = info['name']
+        self.desc = info['description']
+        self.default = info['default']
+        unit = info.get('unit', '')
+        self.suffix = f' {unit}' if unit else ''
+        self.value_map = dict(info.get('value_map') or {})
+        self.results = {}
+
+    def decode(self, raw):
+        res = self.results.get(raw)
+        if res is None:
+            res = MenuResult(self.menu, raw, self.name, self.value_map.get(raw, raw) + self.suffix, self.default, self.desc)
+            if len(self.results) < MENU_CACHE_SIZE:
+                self.results[raw] = res
+        return res
+
+def compile_menu_map(menu_map):
+    table = [None] * (max(int(m) for m in menu_map) + 1)
+    for menu, info in menu_map.items():
+        table[int(menu)] = MenuEntry(menu, info)
+    return tuple(table)
+
+MENU_TABLE = compile_menu_map(MENU_MAP)
+
+def decode_menu(menu_str, raw_value):
+    n = int(menu_str) if menu_str.isdigit() else -1
+    entry = MENU_TABLE[n] if 0 <= n < len(MENU_TABLE) else None
+    if entry is None:
+        entry = MenuEntry(menu_str, UNKNOWN_MENU)
+    return entry.decode(raw_value)
+
+@lru_cache(maxsize=4096)
+def format_line(res):
+    return f"Menu {res.menu}: {res.raw} --> {res.name}: {res.translated} ({res.desc}. Default: {res.default})"
+
+def get_mapped_value(menu_str, raw_value):
+    # Dict form of decode_menu, kept for callers of the original helper
+    return decode_menu(menu_str, raw_value)._asdict()
+
+def decode_replies(replies):
+    # Raw 'EX###<value>;' replies -> MenuResults in one pass; other frames skipped
+    results = []
+    for frame in replies:
+        frame = frame.strip()
+        if frame.startswith('EX') and frame.endswith(';') and len(frame) > 5:
+            results.append(decode_menu(frame[2:5], frame[5:-1].strip()))
+    return results
+
+def read_dump_csv(path):
+    # Menu number -> raw value from a CSV written by perform_dump
+    with open(path, newline='', encoding='utf-8') as f:
+        return {row['Menu'].zfill(3): row['Raw Value'] for row in csv.DictReader(f)}
+
+def read_dump_txt(path):
+    # Menu number -> raw value from a TXT dump ("Menu 001: 0300 --> ...")
+    raw_values = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('Menu ') and ' --> ' in line:
+                menu, _, raw = line[5:line.index(' --> ')].partition(': ')
+                raw_values[menu] = raw.strip()
+    return raw_values
+
+def read_dump_file(path):
+    return read_dump_txt(path) if path.lower().endswith('.txt') else read_dump_csv(path)
+
+def decode_dump_file(path):
+    # Re-decode an archived TXT or CSV dump with the current MENU_MAP
+    return [decode_menu(menu, raw) for menu, raw in read_dump_file(path).items()]
+
+# ================= Command Metrics =================
+class CommandMetrics:
+    # Per command type (EX/FA/MD/...) counters and latency samples, filled in
+    # by send_command and query_menus when a Radio has metrics switched on.
+    # Latencies are measured from the write: time to first byte of the reply
+    # and time to its ';' terminator.
+    COUNTERS = ('commands', 'bytes_written', 'bytes_read', 'retries', 'timeouts', 'errors')
+
+    def __init__(self):
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def record(self, kind, written=0, read=0, first_byte=None, done=None, retries=0, timeout=False, error=False):
+        with self.lock:
+            st = self.stats.get(kind)
+            if st is None:
+                st = self.stats[kind] = dict.fromkeys(self.COUNTERS, 0)
+                st['first_byte'] = []
+                st['terminator'] = []
+            st['commands'] += 1
+            st['bytes_written'] += written
+            st['bytes_read'] += read
+            st['retries'] += retries
+            st['timeouts'] += int(timeout)
+            st['errors'] += int(error)
+            if first_byte is not None:
+                st['first_byte'].append(first_byte)
+            if done is not None:
+                st['terminator'].append(done)
+
+    def to_json(self):
+        out = {}
+        with self.lock:
+            for kind, st in sorted(self.stats.items()):
+                out[kind] = {name: st[name] for name in self.COUNTERS}
+                for name in ('first_byte', 'terminator'):
+                    samples = st[name]
+                    out[kind][name] = {
+                        'count': len(samples),
+                        'sum': round(sum(samples), 6),
+                        'p50': round(_percentile(samples, 50), 6) if samples else None,
+                        'p99': round(_percentile(samples, 99), 6) if samples else None,
+                    }
+        return out
+
+    def summary(self):
+        lines = []
+        for kind, st in self.to_json().items():
+            fb, term = st['first_byte'], st['terminator']
+            ms = lambda v: f"{v * 1000:.1f}" if v is not None else "-"
+            lines.append(f"{kind}: {st['commands']} cmds, {st['bytes_written']} B out, {st['bytes_read']} B in, "
+                         f"first byte p50/p99 {ms(fb['p50'])}/{ms(fb['p99'])} ms, "
+                         f"terminator p50/p99 {ms(term['p50'])}/{ms(term['p99'])} ms, "
+                         f"{st['retries']} retries, {st['timeouts']} timeouts, {st['errors']} errors")
+        return "\n".join(lines)
+
+def format_prometheus(metrics_by_radio):
+    # Prometheus text exposition for {radio label: CommandMetrics}
+    data = {label: m.to_json() for label, m in metrics_by_radio.items()}
+    lines = []
+    for name in CommandMetrics.COUNTERS:
+        metric = f"ft991a_cat_{name}_total"
+        lines.append(f"# TYPE {metric} counter")
+        for label, kinds in data.items():
+            for kind, st in kinds.items():
+                lines.append(f'{metric}{{radio="{label}",command="{kind}"}} {st[name]}')
+    for name in ('first_byte', 'terminator'):
+        metric = f"ft991a_cat_time_to_{name}_seconds"
+        lines.append(f"# TYPE {metric} summary")
+        for label, kinds in data.items():
+            for kind, st in kinds.items():
+                labels = f'radio="{label}",command="{kind}"'
+                for q in ('p50', 'p99'):
+                    if st[name][q] is not None:
+                        lines.append(f'{metric}{{{labels},quantile="0.{q[1:]}"}} {st[name][q]}')
+                lines.append(f"{metric}_sum{{{labels}}} {st[name]['sum']}")
+                lines.append(f"{metric}_count{{{labels}}} {st[name]['count']}")
+    return "\n".join(lines) + "\n"
+
+def _read_frame(ser, timing=None):
+    # One read_until(';'). With timing, the first byte is read on its own so
+    # its arrival time can be stamped into timing['first'].
+    if timing is None:
+        return ser.read_until(b';')
+    first = ser.read(1)
+    if not first:
+        return first
+    timing.setdefault('first', time.time())
+    if first == b';':
+        return first
+    return first + ser.read_until(b';')
+
+# ================= Helper Functions =================
+def read_reply(ser, prefix, timeout=CMD_TIMEOUT, unsolicited=None, timing=None):
+    # Read ';'-terminated frames until one starts with prefix (or the radio
+    # answers '?;'), giving up after timeout seconds. Other frames (e.g.
+    # auto-information updates) go to unsolicited if given.
+    if ser.timeout != timeout:
+        ser.timeout = timeout
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        data = _read_frame(ser, timing)
+        if timing is not None:
+            timing['read'] = timing.get('read', 0) + len(data)
+        frame = data.decode('ascii', errors='ignore').strip()
+        if not frame.endswith(';'):
+            break  # timed out mid-frame
+        if frame.startswith(prefix) or frame == '?;':
+            return frame
+        if unsolicited is not None:
+            unsolicited(frame)
+    return ""
+
+def send_command(ser, cmd, timeout=CMD_TIMEOUT, retries=CMD_RETRIES, unsolicited=None, metrics=None, reply=True):
+    # reply=False is for set commands (FA014250000, AI1, ...), which the
+    # radio doesn't answer: write and return "" without waiting
+    full_cmd = cmd.upper() + ";" if not cmd.endswith(";") else cmd.upper()
+    prefix = full_cmd.rstrip(';')
+    if not reply:
+        ser.write(full_cmd.encode('ascii'))
+        ser.flush()
+        if metrics is not None:
+            metrics.record(prefix[:2], written=len(full_cmd))
+        return ""
+    timing = {} if metrics is not None else None
+    response = ""
+    for attempt in range(retries + 1):
+        sent = time.time()
+        ser.write(full_cmd.encode('ascii'))
+        ser.flush()
+        response = read_reply(ser, prefix, timeout, unsolicited, timing)
+        if response:
+            break
+    if metrics is not None:
+        first = timing.get('first')
+        metrics.record(prefix[:2], written=len(full_cmd) * (attempt + 1), read=timing.get('read', 0),
+                       first_byte=first - sent if first and first >= sent else None,
+                       done=time.time() - sent if response else None,
+                       retries=attempt, timeout=not response, error=response == '?;')
+    return response
+
+MODES = {
+    "01": "LSB",
+    "02": "USB",
+    "03": "CW",
+    "04": "FM",
+    "05": "AM",
+    "06": "FSK (RTTY-LSB)",
+    "07": "CW-R (CW-LSB)",
+    "08": "DATA-L (Data LSB)",
+    "09": "FSK-R (RTTY-USB)",
+    "0A": "DATA-U (Data USB)",
+    "0B": "FM-N (Narrow FM)",
+    "0C": "DATA-FM",
+    "0D": "AM-N (Narrow AM)",
+    "0E": "DATA-FM-N (Narrow Data FM)"
+}
+
+def parse_frequency(resp):
+    if resp.startswith("FA") and resp.endswith(";"):
+        freq_str = resp[2:-1]  # e.g. "014250000"
+        try:
+            freq_mhz = int(freq_str) / 1_000_000.0
+            return f"{freq_mhz:.6f}"
+        except ValueError:
+            return "Error"
+    return "???"
+
+def parse_mode(resp):
+    if resp.startswith("MD") and resp.endswith(";"):
+        code = resp[2:-1]  # e.g., "0A"
+        return MODES.get(code.upper(), f"Unknown ({code})")
+    return "???"
+
+def parse_info(resp):
+    # IF (information) frame: memory channel, VFO frequency, clarifier, mode.
+    # Returns (freq, mode) in the same form as parse_frequency/parse_mode.
+    if not (resp.startswith("IF") and resp.endswith(";") and len(resp) >= 23):
+        return "???", "???"
+    return parse_frequency(f"FA{resp[5:14]};"), parse_mode(f"MD0{resp[21]};")
+
+def get_frequency(ser, timeout=CMD_TIMEOUT, unsolicited=None, metrics=None):
+    return parse_frequency(send_command(ser, "FA", timeout, unsolicited=unsolicited, metrics=metrics))
+
+def get_mode(ser, timeout=CMD_TIMEOUT, unsolicited=None, metrics=None):
+    return parse_mode(send_command(ser, "MD", timeout, unsolicited=unsolicited, metrics=metrics))
+
+
+# ================= Pipelined EX Queries =================
+CAT_VALUE_CHARS = frozenset("+-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz")
+
+def valid_menu_value(menu, value):
+    # Line noise can corrupt a reply and keep its EX### prefix. Values are
+    # signed numbers, or letters and digits for the few text menus (087).
+    if not value or not CAT_VALUE_CHARS.issuperset(value):
+        return False
+    entry = MENU_TABLE[int(menu)] if int(menu) < len(MENU_TABLE) else None
+    if entry is not None and entry.default.lstrip('+-').isdigit():
+        return value.lstrip('+-').isdigit()
+    return True
+
+def query_menus(ser, menus, window=PIPELINE_WINDOW, timeout=CMD_TIMEOUT, passes=PIPELINE_PASSES,
+                unsolicited=None, on_result=None, metrics=None, pacing=None):
+    # Send EX requests a window at a time and map the ';'-framed replies back
+    # to their menu numbers. The window grows by one after every clean batch
+    # and halves when replies go missing (or CTS says the radio is busy);
+    # dropped or garbled menus are re-queried on the next pass.
+    # on_result(menu, raw) is called as each valid reply arrives. With a
+    # pacing dict, the window starts from and is saved to pacing['window'],
+    # so calls made chunk by chunk keep the window they grew.
+    if pacing is not None:
+        window = pacing.get('window', window)
+    results = {}
+    pending = list(menus)
+    for attempt in range(passes):
+        dropped = []
+        garbled = []
+        i = 0
+        while i < len(pending):
+            if getattr(ser, 'rtscts', False) and not ser.cts:
+                window = 1
+            batch = pending[i:i + window]
+            i += len(batch)
+            sent = time.time()
+            ser.write(''.join(f"EX{m};" for m in batch).encode('ascii'))
+            ser.flush()
+
+            waiting = set(batch)
+            timing = {} if metrics is not None else None
+            if ser.timeout != timeout:
+                ser.timeout = timeout
+            # Only replies to this batch push the deadline out, so a stream of
+            # auto-information frames can't hold up a batch with a dropped reply
+            deadline = time.time() + timeout
+            while waiting and time.time() < deadline:
+                frame = _read_frame(ser, timing).decode('ascii', errors='ignore').strip()
+                if not frame.endswith(';'):
+                    break  # nothing more within timeout
+                menu = frame[2:5]
+                if frame.startswith('EX') and menu in waiting:
+                    deadline = time.time() + timeout
+                    waiting.discard(menu)
+                    if not valid_menu_value(menu, frame[5:-1].strip()):
+                        garbled.append(menu)
+                        if metrics is not None:
+                            metrics.record('EX', read=len(frame), error=True)
+                        continue
+                    results[menu] = frame[5:-1].strip()
+                    if metrics is not None:
+                        # First byte is only attributable to the batch's first reply
+                        first = timing.get('first') if len(waiting) == len(batch) - 1 else None
+                        metrics.record('EX', written=len(menu) + 3, read=len(frame),
+                                       first_byte=first - sent if first else None,
+                                       done=time.time() - sent, retries=int(attempt > 0))
+                    if on_result is not None:
+                        on_result(menu, results[menu])
+                elif metrics is not None and frame == '?;':
+                    metrics.record('EX', read=len(frame), error=True)
+                elif unsolicited is not None and not frame.startswith('EX'):
+                    unsolicited(frame)
+
+            if waiting:
+                dropped.extend(m for m in batch if m in waiting)
+                window = max(1, window // 2)
+                if metrics is not None:
+                    for menu in waiting:
+                        metrics.record('EX', written=len(menu) + 3, timeout=True, retries=int(attempt > 0))
+            else:
+                window = min(window + 1, PIPELINE_MAX_WINDOW)
+        pending = dropped + garbled
+        if not pending:
+            break
+    if pacing is not None:
+        pacing['window'] = window
+    return results
+
+def query_menus_sequential(ser, menus, timeout=CMD_TIMEOUT, debug=print, on_result=None, metrics=None):
+    raw_values = {}
+    for menu_str in menus:
+        debug(f"Querying Menu {menu_str}...")
+        for attempt in range(CMD_RETRIES + 1):
+            resp = send_command(ser, f"EX{menu_str}", timeout, metrics=metrics)
+            if not (resp.startswith(f"EX{menu_str}") and resp.endswith(";")):
+                break  # no reply even after send_command's retries
+            value = resp[len(f"EX{menu_str}"):].strip().rstrip(';')
+            if valid_menu_value(menu_str, value):
+                raw_values[menu_str] = value
+                if on_result is not None:
+                    on_result(menu_str, value)
+                break
+            debug(f"Menu {menu_str}: garbled reply {resp!r}, asking again")
+    return raw_values
+
+def dump_menus(ser, log=print, pipelined=True, timeout=CMD_TIMEOUT, debug=None):
+    menus = [f"{n:03d}" for n in range(1, MENU_COUNT + 1)]
+    if pipelined:
+        raw_values = query_menus(ser, menus, timeout=timeout)
+    else:
+        raw_values = query_menus_sequential(ser, menus, timeout, debug or log)
+    return decode_menus(menus, raw_values, log)
+
+def decode_menus(menus, raw_values, log=print):
+    results = []
+    for menu_str in menus:
+        if menu_str not in raw_values:
+            log(f"Menu {menu_str}: Error or no response")
+            continue
+        res = decode_menu(menu_str, raw_values[menu_str])
+        log(format_line(res))
+        results.append(res)
+    return results
+
+# ================= Dump Writers =================
+class DumpWriter:
+    # Streams results to TXT, CSV and/or JSON Lines as they arrive. Rows go
+    # to '<path>.part' files and are flushed one by one, so a crash loses at
+    # most the row being written; close() fsyncs and renames every part into
+    # place. With resume=True, rows already in leftover parts are kept
+    # (see .resumed) and the dump carries on after them.
+    def __init__(self, txt_path=None, csv_path=None, jsonl_path=None, resume=False):
+        self.paths = [(fmt, path) for fmt, path in (('txt', txt_path), ('csv', csv_path), ('jsonl', jsonl_path)) if path]
+        self.resumed = self._load_parts() if resume else []
+        self.files = {}
+        self.csv_writer = None
+        for fmt, path in self.paths:
+            f = open(path + ".part", 'w', newline='' if fmt == 'csv' else None, encoding='utf-8')
+            self.files[fmt] = f
+            if fmt == 'txt':
+                f.write(f"FT-991A Menu Dump - {time.strftime('%Y-%m-%d %H:%M')}\n")
+                f.write("=================\n\n")
+            elif fmt == 'csv':
+                self.csv_writer = csv.writer(f)
+                self.csv_writer.writerow(["Menu", "Raw Value", "Name", "Translated Value", "Default", "Description"])
+        for res in self.resumed:
+            self.write(res)
+
+    def _load_parts(self):
+        # Rows from the most complete leftover part; a torn last line is dropped
+        best = []
+        for fmt, path in self.paths:
+            part = path + ".part"
+            if not os.path.exists(part):
+                continue
+            rows = []
+            with open(part, newline='', encoding='utf-8') as f:
+                if fmt == 'jsonl':
+                    for line in f:
+                        try:
+                            row = json.loads(line)
+                            rows.append((row['menu'], row['raw']))
+                        except (ValueError, KeyError):
+                            break
+                elif fmt == 'csv':
+                    for row in csv.reader(f):
+                        if len(row) == 6 and row[0].isdigit():
+                            rows.append((row[0], row[1]))
+                else:
+                    rows = [(line[5:8], line[10:line.index(' --> ')].strip()) for line in f
+                            if line.startswith('Menu ') and ' --> ' in line and line.endswith('\n')]
+            if len(rows) > len(best):
+                best = rows
+        return [decode_menu(menu, raw) for menu, raw in best]
+
+    def write(self, res):
+        for fmt, f in self.files.items():
+            if fmt == 'txt':
+                f.write(format_line(res) + "\n")
+            elif fmt == 'csv':
+                self.csv_writer.writerow(res)
+            else:
+                f.write(json.dumps(res._asdict()) + "\n")
+            f.flush()
+
+    def close(self, complete=True):
+        # complete=False leaves the .part files behind for a later resume
+        for fmt, path in self.paths:
+            f = self.files.pop(fmt)
+            if complete:
+                os.fsync(f.fileno())
+            f.close()
+            if complete:
+                os.replace(path + ".part", path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.close(complete=exc_type is None)
+
+class OrderedStream:
+    # Hands (menu, raw) replies to emit in menu order, holding back any that
+    # arrive ahead of a menu still outstanding (e.g. one being re-queried)
+    def __init__(self, menus, emit, missing):
+        self.menus = menus
+        self.emit = emit
+        self.missing = missing
+        self.held = {}
+        self.pos = 0
+
+    def feed(self, menu, raw):
+        self.held[menu] = raw
+        while self.pos < len(self.menus) and self.menus[self.pos] in self.held:
+            self.emit(self.menus[self.pos], self.held.pop(self.menus[self.pos]))
+            self.pos += 1
+
+    def finish(self):
+        for menu in self.menus[self.pos:]:
+            if menu in self.held:
+                self.emit(menu, self.held.pop(menu))
+            else:
+                self.missing(menu)
+        self.pos = len(self.menus)
+
+def write_txt(results, path=TXT_OUTPUT):
+    with DumpWriter(txt_path=path) as writer:
+        for res in results:
+            writer.write(res)
+
+def write_csv(results, path=CSV_OUTPUT):
+    with DumpWriter(csv_path=path) as writer:
+        for res in results:
+            writer.write(res)
+
+# ================= Radio / Dumper API =================
+class LinkError(Exception):
+    pass
+
+def probe_link(ser, rates=CAT_RATES, ping_timeout=CMD_TIMEOUT, pings=PROBE_PINGS):
+    # Try each CAT rate with an FA; ping and keep the first that gets a valid
+    # reply within ping_timeout. Returns {'baudrate', 'rtt' (sec, worst of
+    # pings), 'timeout' (fitted to the RTT, at most ping_timeout)} or raises
+    # LinkError explaining what was (not) seen on the wire.
+    heard = []
+    for rate in rates:
+        ser.baudrate = rate
+        ser.reset_input_buffer()
+        ser.write(b"FA;")
+        ser.flush()
+        timing = {}
+        resp = read_reply(ser, "FA", ping_timeout, timing=timing)
+        if not (resp.startswith("FA") and resp[2:-1].isdigit()):
+            if timing.get('read'):
+                heard.append(rate)
+            continue
+        rtts = []
+        for _ in range(pings):
+            start = time.time()
+            if send_command(ser, "FA", ping_timeout, retries=0).startswith("FA"):
+                rtts.append(time.time() - start)
+        if not rtts:
+            raise LinkError(f"Radio answered once at {rate} baud, then stopped replying; check the cable and CAT TOT (Menu 032)")
+        # Room for the slowest ping plus the longest reply we read (IF, ~28 chars)
+        timeout = min(ping_timeout, max(MIN_CMD_TIMEOUT, 3 * max(rtts) + 28 * 10 / rate))
+        return {'baudrate': rate, 'rtt': max(rtts), 'timeout': round(timeout, 3)}
+
+    tried = "/".join(str(r) for r in rates)
+    if heard:
+        raise LinkError(f"Got bytes but no valid reply at {', '.join(map(str, heard))} baud (tried {tried}): "
+                        "baud mismatch or line noise; check Menu 031 CAT RATE")
+    hints = "check the radio is on, the USB cable, and that this is the Enhanced (not Standard) COM port"
+    if getattr(ser, 'rtscts', False) and not ser.cts:
+        hints = "CTS is low, so the radio is not ready to talk: " + hints + "; Menu 033 CAT RTS must match RTS/CTS use"
+    raise LinkError(f"No reply within {ping_timeout:g} s at any CAT rate ({tried}): {hints}")
+
+class Radio:
+    # One FT-991A on one CAT port. Pass ser= to wrap an already open port
+    # (or a SimulatedRadio) instead of opening one. With auto_probe, open()
+    # finds the CAT rate and, unless a timeout was given, sizes the command
+    # timeout from the link RTT.
+    def __init__(self, port=PORT, baudrate=BAUDRATE, timeout=None, ser=None, auto_probe=False):
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = CMD_TIMEOUT if timeout is None else timeout
+        self.fixed_timeout = timeout is not None
+        self.ser = ser
+        self.auto_probe = auto_probe
+        self.link = None     # result of the last probe()
+        self.auto_info = False
+        self.listeners = []  # called with each unsolicited frame
+        self.metrics = None  # set to a CommandMetrics to record per-command stats
+        self.pacing = {}     # pipeline window carried between query_menus calls
+
+    def open(self):
+        if self.ser is None or not self.ser.is_open:
+            try:
+                self.ser = serial.Serial(
+                    port=self.port, baudrate=self.baudrate, timeout=TIMEOUT,
+                    bytesize=serial.EIGHTBITS, parity=serial.PARITY_NONE, stopbits=serial.STOPBITS_ONE,
+                    rtscts=True
+                )
+            except serial.SerialException as e:
+                raise LinkError(f"Cannot open {self.port} ({e}); check the port name and that no other CAT program has it open") from e
+            self.ser.setRTS(True)
+        if self.auto_probe and self.link is None:
+            try:
+                self.probe()
+            except LinkError:
+                self.ser.close()
+                raise
+        return self
+
+    def probe(self):
+        # Configured rate first, then the other CAT rates
+        rates = [self.baudrate] + [r for r in CAT_RATES if r != self.baudrate]
+        self.link = probe_link(self.ser, rates, ping_timeout=self.timeout)
+        self.baudrate = self.link['baudrate']
+        if not self.fixed_timeout:
+            self.timeout = self.link['timeout']
+        return self.link
+
+    def close(self):
+        if self.ser is not None and self.ser.is_open:
+            if self.auto_info:
+                self.set_auto_info(False)
+            self.ser.close()
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def is_open(self):
+        return self.ser is not None and self.ser.is_open
+
+    def send_command(self, cmd, reply=True):
+        return send_command(self.ser, cmd, self.timeout, unsolicited=self.dispatch, metrics=self.metrics, reply=reply)
+
+    def frequency(self):
+        return get_frequency(self.ser, self.timeout, unsolicited=self.dispatch, metrics=self.metrics)
+
+    def mode(self):
+        return get_mode(self.ser, self.timeout, unsolicited=self.dispatch, metrics=self.metrics)
+
+    def query_menus(self, menus, on_result=None):
+        return query_menus(self.ser, menus, timeout=self.timeout, unsolicited=self.dispatch,
+                           on_result=on_result, metrics=self.metrics, pacing=self.pacing)
+
+    def write_menus(self, values, window=PIPELINE_WINDOW):
+        # EX###<value>; set commands, a window at a time. The radio only
+        # answers sets with '?;' on error, so callers verify by reading back.
+        items = sorted(values.items())
+        for i in range(0, len(items), window):
+            self.ser.write(''.join(f"EX{menu}{raw};" for menu, raw in items[i:i + window]).encode('ascii'))
+            self.ser.flush()
+
+    # ----- Auto-information (AI) streaming -----
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def dispatch(self, frame):
+        for callback in self.listeners:
+            callback(frame)
+
+    def set_auto_info(self, on):
+        # AI1; makes the radio send FA/MD/IF/... frames whenever the operator
+        # changes something. It is a set command, so there is no reply.
+        send_command(self.ser, "AI1" if on else "AI0", metrics=self.metrics, reply=False)
+        self.auto_info = on
+
+    def read_unsolicited(self, timeout=AI_POLL_INTERVAL):
+        # Dispatch whatever complete frames have arrived; returns how many.
+        # Once a frame has started, wait long enough for the longest one to
+        # finish at this baud rate (an IF frame takes ~58 ms at 4800).
+        if not self.ser.in_waiting:
+            return 0
+        timeout = max(timeout, 2 * AI_FRAME_MAX * 10 / self.baudrate)
+        if self.ser.timeout != timeout:
+            self.ser.timeout = timeout
+        count = 0
+        while self.ser.in_waiting:
+            frame = self.ser.read_until(b';').decode('ascii', errors='ignore').strip()
+            if not frame.endswith(';'):
+                break
+            self.dispatch(frame)
+            count += 1
+        return count
+
+class MenuDumper:
+    # With a CommandScheduler, EX reads go through its queue so status polls
+    # can share the port during the dump.
+    def __init__(self, radio, log=print, pipelined=True, debug=None, scheduler=None):
+        self.radio = radio
+        self.log = log
+        self.debug = debug
+        self.pipelined = pipelined
+        self.scheduler = scheduler
+
+    def _query(self, menus, on_result=None):
+        if self.scheduler is not None:
+            return self.scheduler.query_menus(menus, on_result=on_result)
+        if not self.pipelined:
+            return query_menus_sequential(self.radio.ser, menus, self.radio.timeout, self.debug or self.log,
+                                          on_result, self.radio.metrics)
+        return self.radio.query_menus(menus, on_result=on_result)
+
+    def dump(self, txt_path=None, csv_path=None, jsonl_path=None, resume=False):
+        # One pass: each reply is decoded, logged and streamed to every
+        # requested format as it arrives (in menu order)
+        writer = DumpWriter(txt_path, csv_path, jsonl_path, resume=resume)
+        results = list(writer.resumed)
+        done = {res.menu for res in results}
+        menus = [f"{n:03d}" for n in range(1, MENU_COUNT + 1) if f"{n:03d}" not in done]
+        if results:
+            self.log(f"Resuming after {len(results)} menus already written...")
+        self.log(f"Starting menu dump (001-{MENU_COUNT:03d})...")
+
+        def emit(menu, raw):
+            res = decode_menu(menu, raw)
+            self.log(format_line(res))
+            writer.write(res)
+            results.append(res)
+
+        stream = OrderedStream(menus, emit, lambda menu: self.log(f"Menu {menu}: Error or no response"))
+        try:
+            self._query(menus, on_result=stream.feed)
+            stream.finish()
+        except BaseException:
+            writer.close(complete=False)
+            raise
+        writer.close()
+        self.log("Dump complete.")
+        for label, path in (("TXT saved", txt_path), ("CSV exported", csv_path), ("JSON Lines saved", jsonl_path)):
+            if path:
+                self.log(f"{label}: {path}")
+        return results
+
+    def dump_incremental(self, snapshot_path, max_age=SNAPSHOT_MAX_AGE, refresh=(), txt_path=None, csv_path=None,
+                         jsonl_path=None):
+        # Re-read only menus missing from the snapshot, older than max_age
+        # seconds (None: never stale), or listed in refresh; the rest come
+        # from the snapshot. No snapshot yet means a full read.
+        snapshot = load_snapshot(snapshot_path) if os.path.exists(snapshot_path) else {}
+        now = time.time()
+        stale = [f"{n:03d}" for n in range(1, MENU_COUNT + 1)
+                 if f"{n:03d}" not in snapshot
+                 or f"{n:03d}" in refresh
+                 or (max_age is not None and now - snapshot[f"{n:03d}"][1] > max_age)]
+        self.log(f"Querying {len(stale)} of {MENU_COUNT} menus ({MENU_COUNT - len(stale)} from snapshot)...")
+        raw_values = self._query(stale) if stale else {}
+
+        merged = dict(snapshot)
+        for menu, raw in raw_values.items():
+            merged[menu] = (decode_menu(menu, raw), now)
+        for menu in stale:
+            if menu not in raw_values:
+                self.log(f"Menu {menu}: Error or no response")
+        save_snapshot(snapshot_path, merged)
+
+        previous = [res for res, _ in snapshot.values()]
+        results = [merged[menu][0] for menu in sorted(merged)]
+        with DumpWriter(txt_path, csv_path, jsonl_path) as writer:
+            for res in results:
+                writer.write(res)
+        for label, path in (("TXT saved", txt_path), ("CSV exported", csv_path), ("JSON Lines saved", jsonl_path)):
+            if path:
+                self.log(f"{label}: {path}")
+        return results, diff_results(previous, results)
+
+
+# ================= Command Scheduler =================
+class CommandScheduler:
+    # Sole owner of a Radio's port. Callers submit jobs (callables taking the
+    # Radio) and get a Future back; one worker thread runs them by priority,
+    # then submission order, so commands never interleave on the wire and each
+    # reply is matched to its command by prefix in send_command. on_error is
+    # called (on the worker) if reading auto-information frames fails.
+    def __init__(self, radio, on_error=None):
+        self.radio = radio
+        self.on_error = on_error
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._queue.put((-1, next(self._seq), None, (), None))
+
+    def submit(self, job, *args, priority=PRIORITY_BULK, callback=None):
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+        self._queue.put((priority, next(self._seq), job, args, future))
+        return future
+
+    def _run(self):
+        while True:
+            try:
+                # With AI on, idle time is spent reading unsolicited frames
+                wait = AI_POLL_INTERVAL if self.radio.auto_info else None
+                _, _, job, args, future = self._queue.get(timeout=wait)
+            except queue.Empty:
+                try:
+                    self.radio.read_unsolicited()
+                except Exception as e:
+                    # Port gone (e.g. USB unplugged): stop idle reads and fail
+                    # what is queued instead of letting the worker die
+                    self.radio.auto_info = False
+                    self._fail_pending(e)
+                    if self.on_error is not None:
+                        self.on_error(e)
+                continue
+            if job is None:
+                break
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(job(self.radio, *args))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _fail_pending(self, error):
+        stop = False
+        while True:
+            try:
+                _, _, job, _, future = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                stop = True
+            elif future.set_running_or_notify_cancel():
+                future.set_exception(error)
+        if stop:
+            self.stop()
+
+    def send(self, cmd, priority=PRIORITY_STATUS, callback=None, reply=True):
+        return self.submit(Radio.send_command, cmd, reply, priority=priority, callback=callback)
+
+    def frequency(self, callback=None):
+        return self.submit(Radio.frequency, priority=PRIORITY_STATUS, callback=callback)
+
+    def mode(self, callback=None):
+        return self.submit(Radio.mode, priority=PRIORITY_STATUS, callback=callback)
+
+    def set_auto_info(self, on, callback=None):
+        return self.submit(Radio.set_auto_info, on, priority=PRIORITY_STATUS, callback=callback)
+
+    def query_menus(self, menus, chunk=SCHEDULER_CHUNK, on_result=None):
+        # Blocks the calling thread (never the worker) until all chunks are
+        # in; on_result runs on the calling thread as each chunk completes
+        futures = [self.submit(Radio.query_menus, menus[i:i + chunk])
+                   for i in range(0, len(menus), chunk)]
+        raw_values = {}
+        for future in futures:
+            chunk_values = future.result()
+            raw_values.update(chunk_values)
+            if on_result is not None:
+                for menu, raw in chunk_values.items():
+                    on_result(menu, raw)
+        return raw_values
+
+
+# ================= Fleet Dumps =================
+FT991A_USB_IDS = {(0x10C4, 0xEA70)}  # Silicon Labs CP2105 bridge inside the FT-991A
+
+def discover_ports():
+    # CAT ports of every attached FT-991A. The CP2105 exposes an Enhanced
+    # (CAT) and a Standard port per radio; only the Enhanced one is returned.
+    from serial.tools import list_ports
+    ports = []
+    for info in list_ports.comports():
+        if (info.vid, info.pid) not in FT991A_USB_IDS:
+            continue
+        if 'Standard' in f"{info.description} {info.interface or ''}":
+            continue
+        ports.append(info.device)
+    return sorted(ports)
+
+def safe_name(label):
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in label)
+
+def radio_label(port):
+    # USB serial number of the radio on port, falling back to the port name
+    from serial.tools import list_ports
+    for info in list_ports.comports():
+        if info.device == port and info.serial_number:
+            return info.serial_number
+    return port
+
+def dump_radio(radio, label, log=print, pipelined=True, out_dir=None):
+    start = time.time()
+    entry = {'radio': label, 'port': radio.port, 'ok': False, 'error': None, 'elapsed': 0.0, 'menus': {}}
+    try:
+        with radio:
+            prefix_log = lambda msg: log(f"[{label}] {msg}")
+            results = MenuDumper(radio, log=prefix_log, pipelined=pipelined).dump()
+        entry['menus'] = {res.menu: res._asdict() for res in results}
+        if radio.metrics is not None:
+            entry['metrics'] = radio.metrics.to_json()
+        entry['ok'] = len(results) == MENU_COUNT
+        if not entry['ok']:
+            entry['error'] = f"{len(results)}/{MENU_COUNT} menus read"
+        if out_dir and results:
+            write_csv(results, os.path.join(out_dir, f"{safe_name(label)}.csv"))
+    except Exception as e:
+        entry['error'] = f"{type(e).__name__}: {e}"
+        log(f"[{label}] Dump failed: {entry['error']}")
+    entry['elapsed'] = round(time.time() - start, 3)
+    return entry
+
+def dump_fleet(radios, max_workers=FLEET_WORKERS, log=print, pipelined=True, out_dir=None):
+    # Dump every (label, Radio) pair on its own thread, at most max_workers at
+    # once. A failing radio only ends its own worker; the report is keyed by
+    # serial port and records the radio label, outcome and menu values.
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    report = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = [pool.submit(dump_radio, radio, label, log, pipelined, out_dir) for label, radio in radios]
+        for future in as_completed(futures):
+            entry = future.result()
+            report[entry['port']] = entry
+    return dict(sorted(report.items()))
+
+# ================= Snapshots =================
+def snapshot_path(label, snapshot_dir=SNAPSHOT_DIR):
+    return os.path.join(snapshot_dir, f"{safe_name(label)}.csv")
+
+def load_snapshot(path):
+    # Menu -> (result, read time) from a snapshot CSV. Plain dump CSVs load
+    # too, dated by the file's modification time. Rows with an unreadable
+    # Read At are left out, so they get read again.
+    file_time = os.path.getmtime(path)
+    snapshot = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            menu = row['Menu'].zfill(3)
+            read_at = row.get('Read At')
+            try:
+                read_at = time.mktime(time.strptime(read_at, '%Y-%m-%dT%H:%M:%S')) if read_at else file_time
+            except ValueError:
+                continue
+            snapshot[menu] = (decode_menu(menu, row['Raw Value']), read_at)
+    return snapshot
+
+def save_snapshot(path, snapshot):
+    # Same columns as the CSV export plus the time each menu was read
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Menu", "Raw Value", "Name", "Translated Value", "Default", "Description", "Read At"])
+        for menu in sorted(snapshot):
+            res, read_at = snapshot[menu]
+            writer.writerow([*res, time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(read_at))])
+    os.replace(tmp, path)
+
+def same_value(a, b):
+    # EX values are zero padded ('0300' vs default '300'), signs included
+    try:
+        return int(a) == int(b)
+    except ValueError:
+        return a.strip().upper() == b.strip().upper()
+
+def diff_results(old, new):
+    # (menu, name, old raw, new raw) for every menu whose value changed
+    old_by_menu = {res.menu: res for res in old}
+    changes = []
+    for res in new:
+        before = old_by_menu.get(res.menu)
+        if before is not None and not same_value(before.raw, res.raw):
+            changes.append((res.menu, res.name, before.raw, res.raw))
+    return changes
+
+def diff_defaults(results):
+    # (menu, name, default, raw) for every menu not at its MENU_MAP default
+    return [(res.menu, res.name, res.default, res.raw) for res in results
+            if res.default not in ('N/A', '???') and not same_value(res.raw, res.default)]
+
+
+# ================= Restore =================
+def validate_value(menu, raw):
+    # Reason raw can't be written to menu per MENU_MAP, or None if it looks OK.
+    # A value map is treated as the full list of settings when it has several
+    # entries, includes the default and the menu has no unit; otherwise it
+    # only names special values of a numeric setting.
+    n = int(menu) if menu.isdigit() else -1
+    entry = MENU_TABLE[n] if 0 < n <= MENU_COUNT and n < len(MENU_TABLE) else None
+    if entry is None:
+        return "unknown menu"
+    if 'read-only' in entry.desc:
+        return "read-only"
+    if not raw or not raw.lstrip('+-').isdigit():
+        return "not a number"
+    vm = entry.value_map
+    if len(vm) >= 2 and entry.default in vm and not entry.suffix and raw not in vm:
+        return f"not one of {', '.join(sorted(vm))}"
+    return None
+
+def restore_menus(radio, target, log=print, dry_run=False, include_link=False):
+    # Write only the menus whose live value differs from target, then read
+    # them back. Returns a report dict of invalid/skipped/changed/failed menus;
+    # 'changed' only holds verified writes. Link menus can't be read back
+    # once written (the link drops), so they are listed under 'link'.
+    report = {'invalid': [], 'skipped': [], 'unchanged': 0, 'changed': [], 'failed': [], 'link': []}
+    wanted = {}
+    for menu, raw in sorted(target.items()):
+        reason = validate_value(menu, raw)
+        if reason == "read-only":
+            report['skipped'].append(menu)
+        elif reason:
+            report['invalid'].append((menu, raw, reason))
+            log(f"Menu {menu}: cannot restore '{raw}' ({reason})")
+        elif menu in LINK_MENUS and not include_link:
+            report['skipped'].append(menu)
+        else:
+            wanted[menu] = raw
+    if report['invalid']:
+        log("Nothing written: fix the invalid values first.")
+        return report
+
+    log(f"Reading {len(wanted)} menus from the radio...")
+    live = radio.query_menus(list(wanted))
+    pending = {}
+    for menu, raw in wanted.items():
+        if menu not in live:
+            report['failed'].append(menu)
+            log(f"Menu {menu}: no response, not written")
+        elif len(live[menu]) != len(raw):
+            report['invalid'].append((menu, raw, f"radio uses {len(live[menu])}-digit values"))
+            log(f"Menu {menu}: cannot restore '{raw}' (radio has '{live[menu]}')")
+        elif live[menu] == raw:
+            report['unchanged'] += 1
+        else:
+            pending[menu] = raw
+            report['link' if menu in LINK_MENUS else 'changed'].append((menu, decode_menu(menu, raw).name, live[menu], raw))
+            log(f"Menu {menu}: {live[menu]} -> {raw}")
+    if dry_run or not pending:
+        return report
+
+    # Link menus go last, once everything else is written and verified
+    link = {menu: raw for menu, raw in pending.items() if menu in LINK_MENUS}
+    pending = {menu: raw for menu, raw in pending.items() if menu not in LINK_MENUS}
+    for _ in range(2):
+        radio.write_menus(pending)
+        readback = radio.query_menus(list(pending))
+        pending = {menu: raw for menu, raw in pending.items() if readback.get(menu) != raw}
+        if not pending:
+            break
+    report['failed'].extend(sorted(pending))
+    report['changed'] = [change for change in report['changed'] if change[0] not in pending]
+    for menu in sorted(pending):
+        log(f"Menu {menu}: verify failed")
+    if link:
+        log(f"Writing link menus {', '.join(sorted(link))} last (not verified); reconnect with the new CAT settings")
+        radio.write_menus(link)
+    return report
+
+        
+# ================= Archive =================
+# Nightly dumps ingested into one SQLite file. Values are clustered by menu so
+# the history of a menu across the fleet is a single index range; each dump
+# also keeps a digest of its values so unchanged nights can be skipped when
+# looking for changes.
+ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dumps (
+    id INTEGER PRIMARY KEY,
+    radio TEXT NOT NULL,
+    taken_at REAL NOT NULL,
+    path TEXT NOT NULL UNIQUE,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    digest BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dumps_radio_time ON dumps (radio, taken_at);
+CREATE TABLE IF NOT EXISTS menu_values (
+    menu INTEGER NOT NULL,
+    dump_id INTEGER NOT NULL REFERENCES dumps (id),
+    raw TEXT NOT NULL,
+    PRIMARY KEY (menu, dump_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS menu_values_dump ON menu_values (dump_id);
+"""
+
+# 2026-10-01, 20261001, 2026-10-01T0300, 20261001_030000, ... standing on
+# their own between separators, so digits inside a label don't count
+DUMP_DATE_RE = re.compile(r'(?<![A-Za-z0-9])(\d{4})-?(\d{2})-?(\d{2})'
+                          r'(?:[T_-](\d{2})[-:]?(\d{2})(?:[-:]?(\d{2}))?)?(?![A-Za-z0-9])')
+
+def _dump_date(name):
+    # (start, end, time) of the first date in name with month and day in
+    # range, or None; an out-of-range time of day is left in the name
+    for m in DUMP_DATE_RE.finditer(name):
+        year, month, day, hour, minute, sec = (int(g or 0) for g in m.groups())
+        if not (1 <= month <= 12 and 1 <= day <= 31):
+            continue
+        if hour < 24 and minute < 60 and sec < 60:
+            return m.start(), m.end(), time.mktime((year, month, day, hour, minute, sec, 0, 0, -1))
+        return m.start(), m.end(3), time.mktime((year, month, day, 0, 0, 0, 0, 0, -1))
+    return None
+
+def parse_dump_name(path):
+    # (radio, time) from the dump's file and directory names, e.g.
+    # SIM1_2026-10-01.csv, SIM1/20261001.csv or 2026-10-01/SIM1.csv (fleet
+    # --out-dir). time is None when neither name carries a date.
+    stem = os.path.splitext(os.path.basename(path))[0]
+    parent = os.path.basename(os.path.dirname(os.path.abspath(path)))
+    taken_at = None
+    names = []
+    for name in (stem, parent):
+        found = _dump_date(name)
+        if found:
+            start, end, when = found
+            if taken_at is None:
+                taken_at = when
+            name = name[:start] + name[end:]
+        names.append(name.strip("-_. "))
+    default_stem = os.path.splitext(CSV_OUTPUT)[0]
+    radio = names[0] if names[0] not in ("", default_stem) else names[1]
+    return radio or stem, taken_at
+
+def iter_dump_files(paths):
+    # Dump files among paths, walking directories; .part files are skipped
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(('.csv', '.txt')):
+                    yield os.path.join(root, name)
+
+def value_key(raw):
+    # Grouping key matching same_value
+    try:
+        return int(raw)
+    except ValueError:
+        return raw.strip().upper()
+
+class DumpArchive:
+    def __init__(self, path=ARCHIVE_DB):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(ARCHIVE_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def ingest(self, paths, radio=None, log=print):
+        # Add new dump files and re-read changed ones; files whose size and
+        # mtime match the archive are skipped without being opened. A file
+        # holding the same radio, time and values as one already archived
+        # (the TXT next to a night's CSV, or a copy) is not stored twice.
+        known = {path: (mtime, size, dump_id)
+                 for path, mtime, size, dump_id in self.db.execute("SELECT path, mtime, size, id FROM dumps")}
+        counts = {'added': 0, 'updated': 0, 'unchanged': 0, 'duplicate': 0, 'failed': 0}
+        with self.db:
+            for path in iter_dump_files(paths):
+                key = os.path.abspath(path)
+                try:
+                    st = os.stat(path)
+                    old = known.get(key)
+                    if old and old[:2] == (st.st_mtime, st.st_size):
+                        counts['unchanged'] += 1
+                        continue
+                    raw_values = read_dump_file(path)
+                except (OSError, ValueError, KeyError, csv.Error) as e:
+                    counts['failed'] += 1
+                    log(f"{path}: not ingested ({type(e).__name__}: {e})")
+                    continue
+                rows = [(int(menu), raw) for menu, raw in raw_values.items() if menu.isdigit()]
+                if not rows:
+                    counts['failed'] += 1
+                    log(f"{path}: no menu values")
+                    continue
+                rows.sort()
+                digest = hashlib.sha1("\n".join(f"{menu}={raw}" for menu, raw in rows).encode()).digest()
+                name_radio, taken_at = parse_dump_name(path)
+                dump_radio, taken_at = radio or name_radio, st.st_mtime if taken_at is None else taken_at
+                if old:
+                    self.db.execute("DELETE FROM menu_values WHERE dump_id = ?", (old[2],))
+                    self.db.execute("DELETE FROM dumps WHERE id = ?", (old[2],))
+                if self.db.execute("SELECT 1 FROM dumps WHERE radio = ? AND taken_at = ? AND digest = ?",
+                                   (dump_radio, taken_at, digest)).fetchone():
+                    counts['duplicate'] += 1
+                    continue
+                cur = self.db.execute(
+                    "INSERT INTO dumps (radio, taken_at, path, mtime, size, digest) VALUES (?, ?, ?, ?, ?, ?)",
+                    (dump_radio, taken_at, key, st.st_mtime, st.st_size, digest))
+                self.db.executemany("INSERT OR REPLACE INTO menu_values (menu, dump_id, raw) VALUES (?, ?, ?)",
+                                    [(menu, cur.lastrowid, raw) for menu, raw in rows])
+                counts['updated' if old else 'added'] += 1
+        return counts
+
+    def radios(self):
+        # (radio, dump count, first, last) for every archived radio
+        return self.db.execute("SELECT radio, COUNT(*), MIN(taken_at), MAX(taken_at) FROM dumps "
+                               "GROUP BY radio ORDER BY radio").fetchall()
+
+    def history(self, menu, radio=None, since=None, until=None):
+        # (radio, menu, time, raw) for every archived value of menu
+        where, params = ["v.menu = ?"], [int(menu)]
+        for cond, value in (("d.radio = ?", radio), ("d.taken_at >= ?", since), ("d.taken_at < ?", until)):
+            if value is not None:
+                where.append(cond)
+                params.append(value)
+        sql = ("SELECT d.radio, d.taken_at, v.raw FROM menu_values v JOIN dumps d ON d.id = v.dump_id WHERE "
+               + " AND ".join(where) + " ORDER BY d.radio, d.taken_at")
+        menu = f"{int(menu):03d}"
+        return [(radio, menu, taken_at, raw) for radio, taken_at, raw in self.db.execute(sql, params)]
+
+    def changes(self, menu=None, radio=None, since=None, until=None):
+        # (radio, menu, time, old raw, new raw) for every value that differs
+        # from the same radio's previous dump, which may be before since.
+        # Only dump pairs whose digests differ have their values read.
+        sql = "SELECT id, radio, taken_at, digest FROM dumps"
+        params = []
+        if radio is not None:
+            sql += " WHERE radio = ?"
+            params.append(radio)
+        pairs = []
+        prev = None
+        for row in self.db.execute(sql + " ORDER BY radio, taken_at, id", params):
+            dump_id, radio_name, taken_at, digest = row
+            if (prev is not None and prev[1] == radio_name and prev[3] != digest
+                    and (since is None or taken_at >= since) and (until is None or taken_at < until)):
+                pairs.append((prev[0], dump_id, radio_name, taken_at))
+            prev = row
+        changes = []
+        for old_id, new_id, radio_name, taken_at in pairs:
+            sql = "SELECT menu, dump_id, raw FROM menu_values WHERE dump_id IN (?, ?)"
+            params = [old_id, new_id]
+            if menu is not None:
+                sql += " AND menu = ?"
+                params.append(int(menu))
+            values = {}
+            for m, dump_id, raw in self.db.execute(sql, params):
+                values.setdefault(m, {})[dump_id] = raw
+            for m, pair in sorted(values.items()):
+                if len(pair) == 2 and pair[old_id] != pair[new_id]:
+                    changes.append((radio_name, f"{m:03d}", taken_at, pair[old_id], pair[new_id]))
+        return changes
+
+    def latest(self, radio=None, until=None):
+        # Radio -> (time, {menu: raw}) from each radio's newest dump before until
+        where, params = [], []
+        if radio is not None:
+            where.append("radio = ?")
+            params.append(radio)
+        if until is not None:
+            where.append("taken_at < ?")
+            params.append(until)
+        sql = ("SELECT d.radio, d.taken_at, v.menu, v.raw FROM ("
+               " SELECT id, ROW_NUMBER() OVER (PARTITION BY radio ORDER BY taken_at DESC, id DESC) AS n FROM dumps"
+               + (" WHERE " + " AND ".join(where) if where else "") + ") l"
+               " JOIN dumps d ON d.id = l.id JOIN menu_values v ON v.dump_id = l.id WHERE l.n = 1")
+        latest = {}
+        for radio, taken_at, menu, raw in self.db.execute(sql, params):
+            latest.setdefault(radio, (taken_at, {}))[1][f"{menu:03d}"] = raw
+        return dict(sorted(latest.items()))
+
+    def drift(self, radio=None, until=None):
+        # Radio -> (time, [(menu, name, default, raw)]) for menus of each
+        # radio's newest dump that are off their MENU_MAP default
+        return {radio: (taken_at, diff_defaults([decode_menu(menu, raw) for menu, raw in sorted(values.items())]))
+                for radio, (taken_at, values) in self.latest(radio, until).items()}
+
+    def outliers(self, share=OUTLIER_SHARE, menu=None, until=None):
+        # (menu, name, radio, raw, common raw, radios sharing it, radios) for
+        # every newest-dump value held by at most share of the radios that
+        # report the menu, and by fewer than the most common value. Menus
+        # reported by fewer than 3 radios are skipped.
+        by_menu = {}
+        for radio, (_, values) in self.latest(until=until).items():
+            for m, raw in values.items():
+                if menu is None or m == menu:
+                    by_menu.setdefault(m, []).append((radio, raw))
+        found = []
+        for m, reports in sorted(by_menu.items()):
+            if len(reports) < 3:
+                continue
+            counts = Counter(value_key(raw) for _, raw in reports)
+            common_key, common_count = counts.most_common(1)[0]
+            common_raw = next(raw for _, raw in reports if value_key(raw) == common_key)
+            for radio, raw in reports:
+                count = counts[value_key(raw)]
+                if count <= share * len(reports) and count < common_count:
+                    found.append((m, decode_menu(m, raw).name, radio, raw, common_raw, common_count, len(reports)))
+        return found
+
+# ================= GUI Class =================
+def _import_tk():
+    # tkinter is only needed for the GUI, so headless runs never load it
+    global tk, scrolledtext, messagebox
+    import tkinter as tk
+    from tkinter import scrolledtext, messagebox
+
+class FT991AGUI:
+    def __init__(self, root, port=PORT, baudrate=BAUDRATE, radio=None):
+        self.root = root
+        self.root.title("FT-991A CAT Control & Menu Dumper")
+        self.root.geometry("700x600")
+        
+        self.radio = radio or Radio(port, baudrate, auto_probe=True)
+        self.radio.add_listener(lambda frame: self.post(self.apply_frame, frame))
+        self.scheduler = CommandScheduler(self.radio, on_error=lambda e: self.post(self.link_lost, e))
+        self.status_pending = False
+        
+        # Worker threads only queue log lines and UI calls; the Tk loop drains them
+        self.log_queue = queue.Queue()
+        self.call_queue = queue.Queue()
+        self.log_level = LOG_LEVEL
+        
+        # Frames
+        top_frame = tk.Frame(root, padx=10, pady=10)
+        top_frame.pack(fill=tk.X)
+        
+        control_frame = tk.Frame(root, padx=10, pady=5)
+        control_frame.pack(fill=tk.X)
+        
+        status_frame = tk.Frame(root, padx=10, pady=5)
+        status_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Status labels (freq/mode from earlier)
+        tk.Label(top_frame, text="Frequency (MHz):", font=("Arial", 12)).grid(row=0, column=0, sticky="w", pady=5)
+        self.freq_label = tk.Label(top_frame, text="---", font=("Arial", 14, "bold"), fg="blue")
+        self.freq_label.grid(row=0, column=1, sticky="w", pady=5)
+        
+        tk.Label(top_frame, text="Mode:", font=("Arial", 12)).grid(row=1, column=0, sticky="w", pady=5)
+        self.mode_label = tk.Label(top_frame, text="---", font=("Arial", 14, "bold"), fg="green")
+        self.mode_label.grid(row=1, column=1, sticky="w", pady=5)
+        
+        tk.Button(top_frame, text="Refresh Status", command=self.refresh_status).grid(row=2, column=0, columnspan=2, pady=10)
+        
+        # Dump buttons
+        tk.Button(control_frame, text="Dump Menus to TXT", command=self.start_dump_txt).grid(row=0, column=0, padx=5, pady=5)
+        tk.Button(control_frame, text="Export Menus to CSV", command=self.start_export_csv).grid(row=0, column=1, padx=5, pady=5)
+        self.live_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(top_frame, text="Live updates (AI)", variable=self.live_var, command=self.toggle_live).grid(row=2, column=2, padx=5, pady=10)
+        self.verbose_var = tk.BooleanVar(value=LOG_LEVEL <= logging.DEBUG)
+        tk.Checkbutton(control_frame, text="Verbose log", variable=self.verbose_var, command=self.set_verbose).grid(row=0, column=2, padx=5, pady=5)
+        
+        # Status log
+        self.status_text = scrolledtext.ScrolledText(status_frame, height=20, width=80, font=("Consolas", 10))
+        self.status_text.pack(fill=tk.BOTH, expand=True)
+        self.log("GUI initialized. Attempting radio connection....")
+        self.root.after(LOG_DRAIN_MS, self.drain_log)
+
+#        self.connect_radio()
+        # Delay connection slightly or call after mainloop starts
+        self.root.after(100, self.connect_radio)  # runs after 100 ms
+        
+#    def log(self, msg):
+#        self.status_text.insert(tk.END, msg + "\n")
+#        self.status_text.see(tk.END)
+#        self.root.after(30000, self.periodic_refresh)
+        
+    def periodic_refresh(self):
+        if not self.radio.auto_info:  # AI pushes updates; no need to poll
+            self.refresh_status()
+        self.root.after(30000, self.periodic_refresh)
+
+    def toggle_live(self):
+        if not self.radio.is_open:
+            self.live_var.set(False)
+            return
+        on = self.live_var.get()
+        self.scheduler.set_auto_info(on)
+        self.log("Live updates (AI) on" if on else "Live updates (AI) off")
+        if on:
+            self.refresh_status()  # AI only reports changes
+
+    def link_lost(self, error):
+        self.live_var.set(False)
+        self.status_pending = False
+        self.log(f"Radio link error: {error}")
+
+    def apply_frame(self, frame):
+        # Unsolicited auto-information frame, on the Tk thread
+        if frame.startswith("FA"):
+            self.freq_label.config(text=parse_frequency(frame))
+        elif frame.startswith("MD"):
+            self.mode_label.config(text=parse_mode(frame))
+        elif frame.startswith("IF"):
+            freq, mode = parse_info(frame)
+            self.freq_label.config(text=freq)
+            self.mode_label.config(text=mode)
+        else:
+            self.debug(f"AI: {frame}")
+
+    def log(self, msg, level=logging.INFO):
+        # Safe from any thread
+        if level >= self.log_level:
+            self.log_queue.put(msg)
+
+    def debug(self, msg):
+        self.log(msg, logging.DEBUG)
+
+    def post(self, func, *args):
+        # Run func(*args) on the Tk thread; safe from any thread
+        self.call_queue.put((func, args))
+
+    def set_verbose(self):
+        self.log_level = logging.DEBUG if self.verbose_var.get() else logging.INFO
+
+    def drain_log(self):
+        try:
+            while True:
+                func, args = self.call_queue.get_nowait()
+                func(*args)
+        except queue.Empty:
+            pass
+        lines = []
+        try:
+            while True:
+                lines.append(self.log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if lines:
+            self.status_text.insert(tk.END, "\n".join(lines) + "\n")
+            excess = int(self.status_text.index('end-1c').split('.')[0]) - 1 - LOG_MAX_LINES
+            if excess > 0:
+                self.status_text.delete('1.0', f'{excess + 1}.0')
+            self.status_text.see(tk.END)
+        self.root.after(LOG_DRAIN_MS, self.drain_log)
+            
+    def connect_radio(self):
+        try:
+            self.radio.open()
+            self.scheduler.start()
+            self.log(f"Connected on {self.radio.port} @ {self.radio.baudrate} baud (RTS/CTS enabled)")
+            if self.radio.link:
+                self.log(f"Link: RTT {self.radio.link['rtt'] * 1000:.1f} ms, command timeout {self.radio.timeout:.3f} s")
+            self.refresh_status()
+            self.root.after(30000, self.periodic_refresh)
+        except Exception as e:
+            self.log(f"Connection failed: {e}")
+            messagebox.showerror("Error", f"Cannot connect: {e}")
+    
+#    def refresh_status(self):
+#        if not self.ser or not self.ser.is_open:
+#            self.log("Not connected.")
+#            return
+        # Simplified; add get_frequency/get_mode from earlier script if needed
+#        self.log("Status refresh (freq/mode placeholder)")
+# Replace the existing refresh_status() with this
+    def refresh_status(self):
+        if not self.radio.is_open:
+            self.log("Not connected.")
+            self.freq_label.config(text="---")
+            self.mode_label.config(text="---")
+            return
+        if self.status_pending:
+            return  # previous poll still queued
+    
+        # Both polls jump ahead of queued dump chunks; labels update on the Tk
+        # thread once the mode reply (queued after frequency) is in
+        self.status_pending = True
+        freq_future = self.scheduler.frequency()
+        self.scheduler.mode(callback=lambda mode_future: self.post(self.show_status, freq_future, mode_future))
+
+    def show_status(self, freq_future, mode_future):
+        self.status_pending = False
+        try:
+            freq = freq_future.result()
+            mode = mode_future.result()
+            self.freq_label.config(text=freq if freq else "Error")
+            self.mode_label.config(text=mode if mode else "Error")
+            self.log(f"Updated: Freq = {freq} MHz, Mode = {mode}")
+        except Exception as e:
+            self.log(f"Refresh error: {e}")
+            self.freq_label.config(text="Error")
+            self.mode_label.config(text="Error")
+            
+    def perform_dump(self, export_csv=False):
+        if not self.radio.is_open:
+            self.log("Not connected to radio.")
+            return
+        dumper = MenuDumper(self.radio, log=self.log, debug=self.debug, scheduler=self.scheduler)
+        dumper.dump(TXT_OUTPUT, CSV_OUTPUT if export_csv else None)
+    
+    def start_dump_txt(self):
+        threading.Thread(target=self.perform_dump, args=(False,), daemon=True).start()
+    
+    def start_export_csv(self):
+        threading.Thread(target=self.perform_dump, args=(True,), daemon=True).start()
+
+# ================= Simulated Radio =================
+EXAMPLE_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "example_saves", "ft991a_menu_dump.csv")
+
+class SimulatedRadio:
+    # Stand-in for serial.Serial that answers FA/MD/EX like the radio. Replies
+    # are paced at the configured baud rate after latency (+/- jitter), and a
+    # fraction of them can be dropped or garbled. factory_reset starts every
+    # menu whose MENU_MAP default fits its width from that default, as after
+    # a menu reset on the radio.
+    def __init__(self, menus=None, baudrate=BAUDRATE, latency=0.005, jitter=0.0,
+                 drop_rate=0.0, garble_rate=0.0, seed=None, cat_rate=None, factory_reset=False):
+        self.baudrate = baudrate  # the port side; set by the client like pyserial
+        self.cat_rate = cat_rate or baudrate  # the radio's Menu 031 setting
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.garble_rate = garble_rate
+        self.timeout = TIMEOUT
+        self.rtscts = True
+        self.cts = True
+        self.is_open = True
+        self.freq = "014250000"
+        self.mode = "02"
+        if menus is None:
+            menus = {m: info['default'] for m, info in MENU_MAP.items() if int(m) <= MENU_COUNT}
+        self.menus = dict(menus)
+        if factory_reset:
+            self.menus.update({m: info['default'] for m, info in MENU_MAP.items()
+                               if m in self.menus and len(info['default']) == len(self.menus[m])})
+        self.auto_info = False
+        self.commands = 0
+        self._random = random.Random(seed)
+        self._rx = bytearray()
+        self._pending = []  # (ready_time, bytes)
+        self._line_free = 0.0
+
+    def _answer(self, cmd):
+        # Reply to one command, or None for set commands (which the radio
+        # does not acknowledge)
+        if cmd == "FA":
+            return f"FA{self.freq};"
+        if cmd == "MD":
+            return f"MD{self.mode};"
+        if cmd == "AI":
+            return f"AI{int(self.auto_info)};"
+        if cmd in ("AI0", "AI1"):
+            self.auto_info = cmd == "AI1"
+            return None
+        if cmd.startswith("FA") and len(cmd) == 11 and cmd[2:].isdigit():
+            self.tune(cmd[2:])
+            return None
+        if cmd.startswith("MD0") and len(cmd) == 4:
+            self.set_mode("0" + cmd[3])
+            return None
+        if cmd.startswith("EX") and cmd[2:5] in self.menus:
+            menu, value = cmd[2:5], cmd[5:]
+            if not value:
+                return f"EX{menu}{self.menus[menu]};"
+            if len(value) != len(self.menus[menu]) or menu == '087':
+                return "?;"
+            self.menus[menu] = value
+            return None
+        return "?;"
+
+    def _garble(self, reply):
+        reply = bytearray(reply)
+        pos = self._random.randrange(len(reply) - 1)  # keep the terminator
+        reply[pos] = self._random.choice(b"#%&*@X")
+        return bytes(reply)
+
+    def _send(self, reply):
+        if self._random.random() < self.drop_rate:
+            return
+        reply = reply.encode('ascii')
+        if self._random.random() < self.garble_rate:
+            reply = self._garble(reply)
+        delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+        self._line_free = max(self._line_free, time.time() + delay) + len(reply) * 10 / self.baudrate
+        self._pending.append((self._line_free, reply))
+
+    def write(self, data):
+        if self.baudrate != self.cat_rate:
+            # Rate mismatch: the radio sees noise and the port sees noise back
+            junk = bytes(self._random.choice(b"\x00\x80\xfe\xf8x") for _ in range(max(1, len(data) // 2)))
+            self._pending.append((time.time() + self.latency, junk))
+            return len(data)
+        for cmd in data.decode('ascii', errors='ignore').split(';')[:-1]:
+            self.commands += 1
+            reply = self._answer(cmd.strip().upper())
+            if reply is not None:
+                self._send(reply)
+        return len(data)
+
+    # Front-panel changes; reported unsolicited when AI is on
+    def tune(self, freq):
+        self.freq = f"{int(freq):09d}"
+        if self.auto_info:
+            self._send(f"FA{self.freq};")
+
+    def set_mode(self, mode):
+        self.mode = mode
+        if self.auto_info:
+            self._send(f"MD{self.mode};")
+
+    def flush(self):
+        pass
+
+    def _collect(self):
+        now = time.time()
+        while self._pending and self._pending[0][0] <= now:
+            self._rx += self._pending.pop(0)[1]
+
+    def next_ready(self):
+        return self._pending[0][0] if self._pending else None
+
+    @property
+    def in_waiting(self):
+        self._collect()
+        return len(self._rx)
+
+    def read_until(self, expected=b';'):
+        deadline = time.time() + (self.timeout or 0)
+        while True:
+            self._collect()
+            idx = self._rx.find(expected)
+            if idx >= 0:
+                out = bytes(self._rx[:idx + len(expected)])
+                del self._rx[:idx + len(expected)]
+                return out
+            now = time.time()
+            if now >= deadline:
+                out = bytes(self._rx)
+                self._rx.clear()
+                return out
+            next_ready = self._pending[0][0] if self._pending else deadline
+            time.sleep(max(0.0, min(next_ready, deadline) - now))
+
+    def read(self, size=1):
+        # Like pyserial: wait up to timeout for size bytes
+        deadline = time.time() + (self.timeout or 0)
+        self._collect()
+        while len(self._rx) < size and self._pending and time.time() < deadline:
+            time.sleep(max(0.0, min(self._pending[0][0], deadline) - time.time()))
+            self._collect()
+        out = bytes(self._rx[:size])
+        del self._rx[:size]
+        return out
+
+    def reset_input_buffer(self):
+        self._rx.clear()
+        self._pending.clear()
+
+    def close(self):
+        self.is_open = False
+
+def serve_pty(radio):
+    # Expose a SimulatedRadio on a pseudo-terminal (POSIX only) so the GUI
+    # or any serial client can open it by path. Returns the slave path.
+    import pty
+    import select
+    import tty
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    path = os.ttyname(slave)
+
+    def pump():
+        while radio.is_open:
+            ready = radio.next_ready()
+            wait = 0.05 if ready is None else max(0.0, min(0.05, ready - time.time()))
+            readable, _, _ = select.select([master], [], [], wait)
+            if readable:
+                radio.write(os.read(master, 1024))
+            waiting = radio.in_waiting
+            if waiting:
+                os.write(master, radio.read(waiting))
+
+    threading.Thread(target=pump, daemon=True).start()
+    return path
+
+# ================= Benchmarks =================
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+def benchmark(dump_iterations=3, poll_iterations=50, **sim_options):
+    # Time the serial hot path against a SimulatedRadio seeded from the
+    # example dump. sim_options are passed through to SimulatedRadio.
+    # Latency percentiles are per command (write to ';'), from CommandMetrics.
+    if 'menus' not in sim_options and os.path.exists(EXAMPLE_CSV):
+        sim_options['menus'] = read_dump_csv(EXAMPLE_CSV)
+    quiet = lambda msg: None
+    menus = [f"{n:03d}" for n in range(1, MENU_COUNT + 1)]
+
+    def scheduled_dump(ser, metrics):
+        # What the GUI's perform_dump runs: MenuDumper through a CommandScheduler
+        radio = Radio("SIM", ser=ser)
+        radio.metrics = metrics
+        scheduler = CommandScheduler(radio).start()
+        try:
+            MenuDumper(radio, log=quiet, scheduler=scheduler).dump()
+        finally:
+            scheduler.stop()
+
+    ops = (
+        ("dump (sequential)", 'EX', lambda ser, m: query_menus_sequential(ser, menus, debug=quiet, metrics=m), dump_iterations),
+        ("dump (pipelined)", 'EX', lambda ser, m: query_menus(ser, menus, metrics=m), dump_iterations),
+        ("dump (scheduled)", 'EX', scheduled_dump, dump_iterations),
+        ("get_frequency", 'FA', lambda ser, m: get_frequency(ser, metrics=m), poll_iterations),
+        ("get_mode", 'MD', lambda ser, m: get_mode(ser, metrics=m), poll_iterations),
+    )
+    print(f"{'operation':<20}{'calls':>6}{'cmds':>7}{'wall s':>9}{'cmds/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'timeouts':>10}")
+    for label, kind, op, iterations in ops:
+        sim = SimulatedRadio(**sim_options)
+        metrics = CommandMetrics()
+        start = time.time()
+        for _ in range(iterations):
+            op(sim, metrics)
+        wall = time.time() - start
+        st = metrics.to_json()[kind]
+        ms = lambda v: f"{v * 1000:.1f}" if v is not None else "-"
+        print(f"{label:<20}{iterations:>6}{st['commands']:>7}{wall:>9.3f}{sim.commands / wall:>9.0f}"
+              f"{ms(st['terminator']['p50']):>9}{ms(st['terminator']['p99']):>9}{st['timeouts']:>10}")
+
+def _decode_uncompiled(menu_str, raw_value):
+    # The original per-item MENU_MAP lookup, kept as the decode baseline
+    info = MENU_MAP.get(menu_str, {'name': 'Unknown', 'description': '', 'default': 'N/A', 'unit': '', 'value_map': None})
+    unit = info.get('unit', '')
+    value_map = info.get('value_map')
+    translated = value_map.get(raw_value, raw_value) if value_map else raw_value
+    if unit:
+        translated += f' {unit}'
+    return {'menu': menu_str, 'raw': raw_value, 'name': info['name'], 'translated': translated,
+            'default': info['default'], 'desc': info['description']}
+
+def clear_decode_caches():
+    format_line.cache_clear()
+    for entry in MENU_TABLE:
+        if entry is not None:
+            entry.results.clear()
+
+def benchmark_decode(paths, repeat=200):
+    # Decode + format (TXT line and CSV row) every row of the given dumps
+    # with the original helpers and with MENU_TABLE. The first pass starts
+    # with empty decode caches and is reported apart from the warm repeats.
+    archives = [read_dump_txt(p) if p.lower().endswith('.txt') else read_dump_csv(p) for p in paths]
+    rows = sum(len(a) for a in archives)
+
+    def uncompiled():
+        for raw_values in archives:
+            for menu, raw in raw_values.items():
+                res = _decode_uncompiled(menu, raw)
+                f"Menu {res['menu']}: {res['raw']} --> {res['name']}: {res['translated']} ({res['desc']}. Default: {res['default']})"
+                [res['menu'], res['raw'], res['name'], res['translated'], res['default'], res['desc']]
+
+    def compiled():
+        for raw_values in archives:
+            for menu, raw in raw_values.items():
+                res = decode_menu(menu, raw)
+                format_line(res)
+                list(res)
+
+    timings = {}
+    for label, run in (("uncompiled", uncompiled), ("compiled", compiled)):
+        clear_decode_caches()
+        start = time.perf_counter()
+        run()
+        cold = time.perf_counter() - start
+        line = f"{label:>10}: {rows} rows, first pass {cold / rows * 1e6:.2f} us/row"
+        warm = None
+        if repeat > 1:
+            start = time.perf_counter()
+            for _ in range(repeat - 1):
+                run()
+            warm = (time.perf_counter() - start) / (repeat - 1)
+            line += f", {repeat - 1} repeats {warm / rows * 1e6:.2f} us/row"
+        timings[label] = (cold, warm)
+        print(line)
+    speedup = f"   speedup: first pass {timings['uncompiled'][0] / timings['compiled'][0]:.1f}x"
+    if repeat > 1:
+        speedup += f", repeats {timings['uncompiled'][1] / timings['compiled'][1]:.1f}x"
+    print(speedup)
+
+# ================= Command Line =================
+def run_gui(port=PORT, baudrate=BAUDRATE, radio=None):
+    _import_tk()
+    root = tk.Tk()
+    app = FT991AGUI(root, port, baudrate, radio)
+    root.mainloop()
+
+def _wants_metrics(args):
+    return args.metrics or args.metrics_json or args.metrics_prom
+
+def _make_radio(args):
+    if args.simulate:
+        sim = SimulatedRadio(menus=read_dump_csv(args.sim_menus), factory_reset=args.sim_factory_reset)
+        radio = Radio("SIM", args.baud, args.timeout, ser=sim, auto_probe=not args.no_probe)
+    else:
+        radio = Radio(args.port, args.baud, args.timeout, auto_probe=not args.no_probe)
+    if _wants_metrics(args):
+        radio.metrics = CommandMetrics()
+        args.metered = {radio.port: radio.metrics}
+    return radio
+
+def _open_radio(args):
+    return _make_radio(args).open()
+
+def export_metrics(args, metered):
+    if args.metrics:
+        for label, metrics in metered.items():
+            print(f"[{label}]\n{metrics.summary()}")
+    if args.metrics_json:
+        with open(args.metrics_json, 'w', encoding='utf-8') as f:
+            json.dump({label: m.to_json() for label, m in metered.items()}, f, indent=2)
+    if args.metrics_prom:
+        with open(args.metrics_prom, 'w', encoding='utf-8') as f:
+            f.write(format_prometheus(metered))
+
+def cmd_dump(args):
+    log = (lambda msg: None) if args.quiet else print
+    incremental = args.incremental or args.refresh or args.max_age is not None
+    if incremental and args.resume:
+        print("--resume is for full dumps; incremental dumps already reuse the snapshot")
+        return 2
+    with _open_radio(args) as radio:
+        dumper = MenuDumper(radio, log=log, pipelined=not args.sequential)
+        if incremental:
+            path = snapshot_path("SIM" if args.simulate else radio_label(args.port), args.snapshot_dir)
+            max_age = args.max_age * 3600 if args.max_age is not None else SNAPSHOT_MAX_AGE
+            refresh = {menu.zfill(3) for menu in args.refresh or ()}
+            results, changes = dumper.dump_incremental(path, max_age, refresh, args.txt, args.csv, args.jsonl)
+            print(f"{len(changes)} menus changed since the last snapshot")
+            for menu, name, old, new in changes:
+                print(f"  Menu {menu} {name}: {old} -> {new}")
+        else:
+            results = dumper.dump(args.txt, args.csv, args.jsonl, resume=args.resume)
+    print(f"{len(results)}/{MENU_COUNT} menus read")
+    return 0 if len(results) == MENU_COUNT else 1
+
+def cmd_diff(args):
+    for path in (args.csv, args.other):
+        if path and not os.path.exists(path):
+            print(f"No such file: {path}")
+            return 2
+    if args.other:
+        old = [res for res, _ in load_snapshot(args.csv).values()]
+        new = [res for res, _ in load_snapshot(args.other).values()]
+        changes = diff_results(old, new)
+        print(f"{len(changes)} menus differ between {args.csv} and {args.other}")
+    else:
+        results = [res for res, _ in load_snapshot(args.csv).values()]
+        changes = diff_defaults(results)
+        print(f"{len(changes)} menus differ from their defaults in {args.csv}")
+    for menu, name, old, new in changes:
+        print(f"  Menu {menu} {name}: {old} -> {new}")
+    return 0
+
+def cmd_probe(args):
+    try:
+        with _open_radio(args) as radio:
+            link = radio.link or radio.probe()
+    except LinkError as e:
+        print(f"Link check failed: {e}")
+        return 1
+    print(f"CAT rate {link['baudrate']} baud, RTT {link['rtt'] * 1000:.1f} ms, command timeout {radio.timeout:.3f} s")
+    return 0
+
+def cmd_status(args):
+    with _open_radio(args) as radio:
+        print(f"Freq = {radio.frequency()} MHz, Mode = {radio.mode()}")
+        if args.watch:
+            def show(frame):
+                if frame.startswith("FA"):
+                    print(f"Freq = {parse_frequency(frame)} MHz")
+                elif frame.startswith("MD"):
+                    print(f"Mode = {parse_mode(frame)}")
+                elif frame.startswith("IF"):
+                    print("Freq = {} MHz, Mode = {}".format(*parse_info(frame)))
+            radio.add_listener(show)
+            radio.set_auto_info(True)
+            try:
+                while True:
+                    if not radio.read_unsolicited():
+                        time.sleep(AI_POLL_INTERVAL)
+            except KeyboardInterrupt:
+                pass
+    return 0
+
+def cmd_bench(args):
+    benchmark(dump_iterations=args.dumps, poll_iterations=args.polls, baudrate=args.baud,
+              latency=args.latency, jitter=args.jitter, drop_rate=args.drop_rate,
+              garble_rate=args.garble_rate, seed=args.seed)
+    return 0
+
+def cmd_simulate(args):
+    radio = SimulatedRadio(menus=read_dump_csv(args.menus), baudrate=args.baud, latency=args.latency)
+    print(f"Simulated FT-991A on {serve_pty(radio)} (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        radio.close()
+    return 0
+
+def cmd_fleet(args):
+    if args.simulate:
+        radios = [(f"SIM{n}", Radio(f"SIM{n}", timeout=args.timeout, ser=SimulatedRadio(menus=read_dump_csv(EXAMPLE_CSV))))
+                  for n in range(1, args.simulate + 1)]
+    else:
+        ports = args.ports or discover_ports()
+        if not ports:
+            print("No FT-991A CAT ports found; pass them with --ports")
+            return 1
+        radios = [(radio_label(port), Radio(port, args.baud, args.timeout, auto_probe=not args.no_probe))
+                  for port in ports]
+    if _wants_metrics(args):
+        for label, radio in radios:
+            radio.metrics = CommandMetrics()
+        args.metered = {label: radio.metrics for label, radio in radios}
+    log = (lambda msg: None) if args.quiet else print
+    start = time.time()
+    report = dump_fleet(radios, max_workers=args.workers, log=log, pipelined=not args.sequential, out_dir=args.out_dir)
+    for port, entry in report.items():
+        status = "OK" if entry['ok'] else f"FAILED ({entry['error']})"
+        print(f"{entry['radio']:<20}{port:<16}{entry['elapsed']:>8.2f} s  {status}")
+    print(f"{len(report)} radios in {time.time() - start:.2f} s")
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0 if all(entry['ok'] for entry in report.values()) else 1
+
+def cmd_decode(args):
+    for dir_path in (args.txt_dir, args.csv_dir):
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+    for path in args.files:
+        results = decode_dump_file(path)
+        base = os.path.splitext(os.path.basename(path))[0]
+        if args.txt_dir:
+            write_txt(results, os.path.join(args.txt_dir, base + ".txt"))
+        if args.csv_dir:
+            write_csv(results, os.path.join(args.csv_dir, base + ".csv"))
+        if not (args.txt_dir or args.csv_dir):
+            print("\n".join(format_line(res) for res in results))
+    return 0
+
+def cmd_bench_decode(args):
+    benchmark_decode(args.files or [EXAMPLE_CSV, EXAMPLE_CSV[:-4] + ".txt"], args.repeat)
+    return 0
+
+def cmd_restore(args):
+    target = read_dump_file(args.file)
+    with _open_radio(args) as radio:
+        start = time.time()
+        report = restore_menus(radio, target, dry_run=args.dry_run, include_link=args.include_link_menus)
+    verb = "would change" if args.dry_run else "changed"
+    print(f"{len(report['changed'])} menus {verb}, {report['unchanged']} already matched, "
+          f"{len(report['skipped'])} skipped, {len(report['invalid'])} invalid, "
+          f"{len(report['failed'])} failed in {time.time() - start:.2f} s")
+    if report['link']:
+        written = "would be written" if args.dry_run else "written last, not verified"
+        print(f"{len(report['link'])} link menus {written}: {', '.join(change[0] for change in report['link'])}")
+    return 0 if not (report['invalid'] or report['failed']) else 1
+
+def parse_when(text):
+    # --since/--until: a month, a day or a local date and time
+    for fmt in ('%Y-%m', '%Y-%m-%d', '%Y-%m-%dT%H:%M', '%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M:%S'):
+        try:
+            return time.mktime(time.strptime(text, fmt))
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f"'{text}' is not YYYY-mm[-dd[THH:MM]]")
+
+def menu_number(text):
+    # Menu arguments: '31' or '031' -> '031'
+    if not (text.isdigit() and 0 < int(text) < len(MENU_TABLE)):
+        raise argparse.ArgumentTypeError(f"'{text}' is not a menu number (001-{len(MENU_TABLE) - 1:03d})")
+    return f"{int(text):03d}"
+
+def format_when(t):
+    return time.strftime('%Y-%m-%d %H:%M', time.localtime(t))
+
+def cmd_archive_ingest(args):
+    start = time.time()
+    with DumpArchive(args.db) as archive:
+        counts = archive.ingest(args.paths, radio=args.radio)
+    print(f"{counts['added']} added, {counts['updated']} updated, {counts['unchanged']} unchanged, "
+          f"{counts['duplicate']} duplicates, {counts['failed']} failed in {time.time() - start:.2f} s")
+    return 0 if not counts['failed'] else 1
+
+def cmd_archive_list(args):
+    with DumpArchive(args.db) as archive:
+        radios = archive.radios()
+    for radio, count, first, last in radios:
+        print(f"{radio:<20}{count:>6} dumps  {format_when(first)} .. {format_when(last)}")
+    print(f"{len(radios)} radios")
+    return 0
+
+def cmd_archive_history(args):
+    with DumpArchive(args.db) as archive:
+        if args.changes or args.menu is None:
+            rows = archive.changes(args.menu, args.radio, args.since, args.until)
+        else:
+            rows = [(radio, m, taken_at, None, raw)
+                    for radio, m, taken_at, raw in archive.history(args.menu, args.radio, args.since, args.until)]
+    for radio, m, taken_at, old, new in rows:
+        change = new if old is None else f"{old} -> {new}"
+        print(f"{format_when(taken_at)}  {radio:<20}Menu {m} {decode_menu(m, new).name}: {change}")
+    if args.changes or args.menu is None:
+        print(f"{len(rows)} changes on {len({row[0] for row in rows})} radios")
+    return 0
+
+def cmd_archive_drift(args):
+    with DumpArchive(args.db) as archive:
+        drift = archive.drift(args.radio, args.until)
+    off = Counter()
+    for radio, (taken_at, changes) in drift.items():
+        off.update((menu, name, default) for menu, name, default, _ in changes)
+        if args.radio or args.verbose:
+            print(f"{radio} ({format_when(taken_at)}): {len(changes)} menus off default")
+            for menu, name, default, raw in changes:
+                print(f"  Menu {menu} {name}: {default} -> {raw}")
+    if not args.radio:
+        print(f"Menus off default across {len(drift)} radios:")
+        for (menu, name, default), count in sorted(off.items(), key=lambda item: (-item[1], item[0])):
+            print(f"  Menu {menu} {name} (default {default}): {count} radios")
+    return 0
+
+def cmd_archive_outliers(args):
+    with DumpArchive(args.db) as archive:
+        found = archive.outliers(args.share, args.menu, args.until)
+    for m, name, radio, raw, common, count, total in found:
+        print(f"Menu {m} {name}: {radio} has {raw}, {count}/{total} radios have {common}")
+    print(f"{len(found)} outlying values on {len({row[2] for row in found})} radios")
+    return 0
+
+def cmd_gui(args):
+    # The GUI opens the radio itself once its window is up
+    radio = _make_radio(args)
+    run_gui(args.port, args.baud, radio)
+    radio.close()
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="ft-991a_menu_dump", description="FT-991A CAT menu dumper")
+    link = argparse.ArgumentParser(add_help=False)
+    link.add_argument("--port", default=PORT, help=f"CAT (Enhanced COM) port, default {PORT}")
+    link.add_argument("--baud", type=int, default=BAUDRATE, help="must match Menu 031 CAT RATE")
+    link.add_argument("--timeout", type=float, default=None,
+                      help=f"per-command reply timeout (sec); default: fitted by the probe, at most {CMD_TIMEOUT}")
+    link.add_argument("--simulate", action="store_true", help="talk to the built-in simulator instead of a radio")
+    link.add_argument("--no-probe", action="store_true", help="skip the connect-time CAT rate/latency probe")
+    link.add_argument("--sim-menus", default=EXAMPLE_CSV, metavar="CSV", help="dump CSV the simulator's menus start from")
+    link.add_argument("--sim-factory-reset", action="store_true",
+                      help="start the simulator from the MENU_MAP defaults, as after a menu reset")
+    metrics = argparse.ArgumentParser(add_help=False)
+    metrics.add_argument("--metrics", action="store_true", help="print per-command serial metrics at the end")
+    metrics.add_argument("--metrics-json", default=None, metavar="PATH", help="write serial metrics as JSON")
+    metrics.add_argument("--metrics-prom", default=None, metavar="PATH", help="write serial metrics in Prometheus text format")
+    link = argparse.ArgumentParser(add_help=False, parents=[link, metrics])
+    sub = parser.add_subparsers(dest="command")
+
+    p = sub.add_parser("gui", parents=[link], help="run the tkinter GUI (default)")
+    p.set_defaults(func=cmd_gui)
+
+    p = sub.add_parser("dump", parents=[link], help="dump all menus without a display")
+    p.add_argument("--txt", default=TXT_OUTPUT, help="text output path")
+    p.add_argument("--csv", default=None, help="also write CSV to this path")
+    p.add_argument("--jsonl", default=None, help="also write JSON Lines to this path")
+    p.add_argument("--resume", action="store_true", help="continue an interrupted dump from its .part files (not with --incremental)")
+    p.add_argument("--sequential", action="store_true", help="query one menu at a time")
+    p.add_argument("--quiet", action="store_true", help="only print the summary")
+    p.add_argument("--incremental", action="store_true", help="only re-read menus missing or stale in the snapshot")
+    p.add_argument("--max-age", type=float, default=None, help=f"hours before a snapshot value is stale, default {SNAPSHOT_MAX_AGE / 3600:g} (implies --incremental)")
+    p.add_argument("--refresh", nargs="+", metavar="MENU", help="always re-read these menus (implies --incremental)")
+    p.add_argument("--snapshot-dir", default=SNAPSHOT_DIR, help="where per-radio snapshots are kept")
+    p.set_defaults(func=cmd_dump)
+
+    p = sub.add_parser("diff", help="compare a dump or snapshot CSV with the defaults or another CSV")
+    p.add_argument("csv", help="dump or snapshot CSV")
+    p.add_argument("other", nargs="?", help="second CSV (default: compare with MENU_MAP defaults)")
+    p.set_defaults(func=cmd_diff)
+
+    p = sub.add_parser("restore", parents=[link], help="write a saved dump back to the radio")
+    p.add_argument("file", help="CSV (or TXT) dump to restore")
+    p.add_argument("--dry-run", action="store_true", help="only show what would change")
+    p.add_argument("--include-link-menus", action="store_true",
+                   help=f"also restore {'/'.join(LINK_MENUS)} (CAT RATE/TOT/RTS), written last")
+    p.set_defaults(func=cmd_restore)
+
+    p = sub.add_parser("fleet", parents=[metrics], help="dump several radios in parallel")
+    p.add_argument("--ports", nargs="+", help="CAT ports (default: discover FT-991As over USB)")
+    p.add_argument("--baud", type=int, default=BAUDRATE)
+    p.add_argument("--timeout", type=float, default=None)
+    p.add_argument("--no-probe", action="store_true", help="skip the connect-time CAT rate/latency probe")
+    p.add_argument("--workers", type=int, default=FLEET_WORKERS, help="max radios dumped at once")
+    p.add_argument("--out-dir", default=None, help="write one CSV per radio here")
+    p.add_argument("--report", default=None, help="write the combined JSON report here")
+    p.add_argument("--sequential", action="store_true", help="query one menu at a time")
+    p.add_argument("--quiet", action="store_true", help="only print the summary")
+    p.add_argument("--simulate", type=int, default=0, metavar="N", help="dump N simulated radios instead")
+    p.set_defaults(func=cmd_fleet)
+
+    p = sub.add_parser("archive", help="ingest nightly dump files and query them across the fleet")
+    store = argparse.ArgumentParser(add_help=False)
+    store.add_argument("--db", default=ARCHIVE_DB, help=f"archive database, default {ARCHIVE_DB}")
+    actions = p.add_subparsers(dest="action", required=True)
+    a = actions.add_parser("ingest", parents=[store], help="add new or changed dump files (directories are walked)")
+    a.add_argument("paths", nargs="+")
+    a.add_argument("--radio", default=None, help="radio name for these files (default: from file/dir names)")
+    a.set_defaults(func=cmd_archive_ingest)
+    a = actions.add_parser("list", parents=[store], help="archived radios and their dump ranges")
+    a.set_defaults(func=cmd_archive_list)
+    a = actions.add_parser("history", parents=[store], help="value history of a menu")
+    a.add_argument("menu", nargs="?", type=menu_number, help="menu number (default: changes to any menu)")
+    a.add_argument("--radio", default=None)
+    a.add_argument("--since", type=parse_when, default=None, metavar="WHEN", help="YYYY-mm[-dd[THH:MM]]")
+    a.add_argument("--until", type=parse_when, default=None, metavar="WHEN", help="exclusive")
+    a.add_argument("--changes", action="store_true", help="only show where the value changed")
+    a.set_defaults(func=cmd_archive_history)
+    a = actions.add_parser("drift", parents=[store], help="menus off their MENU_MAP defaults in each radio's newest dump")
+    a.add_argument("--radio", default=None, help="list one radio's drifted menus")
+    a.add_argument("--until", type=parse_when, default=None, metavar="WHEN", help="use the newest dumps before this")
+    a.add_argument("--verbose", action="store_true", help="list the drifted menus of every radio")
+    a.set_defaults(func=cmd_archive_drift)
+    a = actions.add_parser("outliers", parents=[store], help="values few radios in the fleet share")
+    a.add_argument("--menu", type=menu_number, default=None)
+    a.add_argument("--share", type=float, default=OUTLIER_SHARE, help="outlier if held by at most this share of radios")
+    a.add_argument("--until", type=parse_when, default=None, metavar="WHEN", help="use the newest dumps before this")
+    a.set_defaults(func=cmd_archive_outliers)
+
+    p = sub.add_parser("probe", parents=[link], help="find the CAT rate and measure link latency")
+    p.set_defaults(func=cmd_probe)
+
+    p = sub.add_parser("status", parents=[link], help="print frequency and mode")
+    p.add_argument("--watch", action="store_true", help="keep printing changes using auto-information (AI1;)")
+    p.set_defaults(func=cmd_status)
+
+    p = sub.add_parser("bench", help="benchmark the serial path against the simulator")
+    p.add_argument("--baud", type=int, default=BAUDRATE)
+    p.add_argument("--latency", type=float, default=0.005, help="reply latency (sec)")
+    p.add_argument("--jitter", type=float, default=0.0, help="+/- latency jitter (sec)")
+    p.add_argument("--drop-rate", type=float, default=0.0, help="fraction of replies dropped")
+    p.add_argument("--garble-rate", type=float, default=0.0, help="fraction of replies garbled")
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--dumps", type=int, default=3, help="full dumps per mode")
+    p.add_argument("--polls", type=int, default=50, help="FA/MD queries")
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("decode", help="re-decode archived TXT/CSV dumps with the current MENU_MAP")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--txt-dir", default=None, help="write decoded TXT files here")
+    p.add_argument("--csv-dir", default=None, help="write decoded CSV files here")
+    p.set_defaults(func=cmd_decode)
+
+    p = sub.add_parser("bench-decode", help="micro-benchmark menu decoding over saved dumps")
+    p.add_argument("files", nargs="*", help="dump files (default: the example saves)")
+    p.add_argument("--repeat", type=int, default=200)
+    p.set_defaults(func=cmd_bench_decode)
+
+    p = sub.add_parser("simulate", help="serve the simulator on a pty (POSIX)")
+    p.add_argument("--menus", default=EXAMPLE_CSV, help="dump CSV to seed menu values from")
+    p.add_argument("--baud", type=int, default=BAUDRATE)
+    p.add_argument("--latency", type=float, default=0.005)
+    p.set_defaults(func=cmd_simulate)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        run_gui()
+        return 0
+    try:
+        status = args.func(args)
+    except LinkError as e:
+        print(f"Link check failed: {e}")
+        return 2
+    if getattr(args, 'metered', None):
+        export_metrics(args, args.metered)
+    return status
+
+# ================= Main =================
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import ft991a_menu_dump  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def ft():
+    return ft991a_menu_dump
+
+
+@pytest.fixture
+def example(ft):
+    return ft.read_dump_csv(ft.EXAMPLE_CSV)
+
+
+@pytest.fixture
+def menus(ft):
+    return [f"{n:03d}" for n in range(1, ft.MENU_COUNT + 1)]
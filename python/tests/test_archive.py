@@ -0,0 +1,87 @@
+import argparse
+import os
+import time
+
+import pytest
+
+
+def local(*fields):
+    return time.mktime((*fields, 0, 0, -1))
+
+
+def write_dump(ft, path, values):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    ft.write_csv([ft.decode_menu(m, raw) for m, raw in sorted(values.items())], path)
+
+
+@pytest.mark.parametrize("path, radio, when", [
+    ("SIM1_2026-10-01.csv", "SIM1", (2026, 10, 1, 0, 0, 0)),
+    ("dumps/SIM1/20261001.csv", "SIM1", (2026, 10, 1, 0, 0, 0)),
+    ("2026-10-01/SIM1.csv", "SIM1", (2026, 10, 1, 0, 0, 0)),
+    ("SIM1/ft991a_menu_dump_20261001_031500.csv", "SIM1", (2026, 10, 1, 3, 15, 0)),
+    ("2026-10-01/A12345678.csv", "A12345678", (2026, 10, 1, 0, 0, 0)),
+    ("nightly/98765432.csv", "98765432", None),
+])
+def test_parse_dump_name(ft, path, radio, when):
+    assert ft.parse_dump_name(path) == (radio, local(*when) if when else None)
+
+
+def test_ingest_is_incremental(ft, example, tmp_path):
+    for day in (1, 2):
+        for n in (1, 2):
+            write_dump(ft, str(tmp_path / f"2026-10-0{day}" / f"SIM{n}.csv"), example)
+    with ft.DumpArchive(str(tmp_path / "a.db")) as archive:
+        log = []
+        assert archive.ingest([str(tmp_path)], log=log.append) == {'added': 4, 'updated': 0, 'unchanged': 0, 'duplicate': 0, 'failed': 0}
+        assert archive.ingest([str(tmp_path)]) == {'added': 0, 'updated': 0, 'unchanged': 4, 'duplicate': 0, 'failed': 0}
+
+        path = str(tmp_path / "2026-10-02" / "SIM2.csv")
+        write_dump(ft, path, dict(example, **{'031': '1'}))
+        os.utime(path, (time.time() + 5, time.time() + 5))
+        assert archive.ingest([str(tmp_path)])['updated'] == 1
+        assert [row[0] for row in archive.radios()] == ['SIM1', 'SIM2']
+        assert archive.changes() == [('SIM2', '031', local(2026, 10, 2, 0, 0, 0), '3', '1')]
+        assert archive.changes(since=local(2026, 10, 3, 0, 0, 0)) == []
+        assert [row[3] for row in archive.history('031', radio='SIM2')] == ['3', '1']
+
+
+def test_txt_and_csv_of_one_night_are_one_dump(ft, example, tmp_path):
+    results = [ft.decode_menu(m, raw) for m, raw in sorted(example.items())]
+    os.makedirs(tmp_path / "RIG1")
+    ft.write_txt(results, str(tmp_path / "RIG1" / "2026-10-01.txt"))
+    ft.write_csv(results, str(tmp_path / "RIG1" / "2026-10-01.csv"))
+    with ft.DumpArchive(str(tmp_path / "a.db")) as archive:
+        counts = archive.ingest([str(tmp_path)])
+        assert (counts['added'], counts['duplicate']) == (1, 1)
+        assert archive.radios() == [('RIG1', 1, local(2026, 10, 1, 0, 0, 0), local(2026, 10, 1, 0, 0, 0))]
+        assert len(archive.history('031')) == 1
+        assert archive.ingest([str(tmp_path)])['added'] == 0
+        assert len(archive.history('031')) == 1
+        assert not archive.outliers()
+
+        # A different TXT for the same night is a dump of its own
+        ft.write_txt([ft.decode_menu(m, '1' if m == '031' else raw) for m, raw in sorted(example.items())],
+                     str(tmp_path / "RIG1" / "2026-10-01.txt"))
+        os.utime(tmp_path / "RIG1" / "2026-10-01.txt", (time.time() + 5, time.time() + 5))
+        assert archive.ingest([str(tmp_path)])['added'] == 1
+        assert sorted(row[3] for row in archive.history('031')) == ['1', '3']
+
+
+def test_drift_and_outliers(ft, example, tmp_path):
+    for n in range(1, 5):
+        values = dict(example, **{'031': '1'}) if n == 4 else example
+        write_dump(ft, str(tmp_path / "2026-10-01" / f"RIG{n}.csv"), values)
+    with ft.DumpArchive(str(tmp_path / "a.db")) as archive:
+        archive.ingest([str(tmp_path)])
+        found = archive.outliers()
+        assert [(row[0], row[2], row[3], row[4]) for row in found] == [('031', 'RIG4', '1', '3')]
+        drift = archive.drift()
+        assert '031' in [change[0] for change in drift['RIG4'][1]]
+        assert '031' not in [change[0] for change in drift['RIG1'][1]]
+
+
+def test_menu_number(ft):
+    assert ft.menu_number('31') == '031'
+    for text in ('abc', '0', '999'):
+        with pytest.raises(argparse.ArgumentTypeError):
+            ft.menu_number(text)
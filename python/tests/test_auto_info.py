@@ -0,0 +1,102 @@
+import threading
+import time
+
+IF_FRAME = "IF001014250000+000000200000;"  # 28 chars, ~58 ms at 4800 baud
+
+
+def byte_paced(ft):
+    class BytePaced(ft.SimulatedRadio):
+        # Bytes arrive one at a time at the baud rate, as on a real line
+        def _send(self, reply):
+            start = max(self._line_free, time.time() + self.latency)
+            per_byte = 10 / self.baudrate
+            for i, byte in enumerate(reply.encode('ascii')):
+                self._pending.append((start + (i + 1) * per_byte, bytes([byte])))
+            self._line_free = start + len(reply) * per_byte
+
+    return BytePaced
+
+
+def test_slow_frames_arrive_whole(ft):
+    sim = byte_paced(ft)(baudrate=4800, latency=0.0)
+    radio = ft.Radio("SIM", baudrate=4800, ser=sim).open()
+    frames = []
+    radio.add_listener(frames.append)
+    sim._send(IF_FRAME)
+    sim._send("MD03;")
+    deadline = time.time() + 1
+    while len(frames) < 2 and time.time() < deadline:
+        if not radio.read_unsolicited():
+            time.sleep(0.001)
+    assert frames == [IF_FRAME, "MD03;"]
+
+
+def test_listeners_get_frames_while_idle(ft):
+    radio = ft.Radio("SIM", ser=ft.SimulatedRadio(latency=0.001)).open()
+    frames = []
+    radio.add_listener(frames.append)
+    scheduler = ft.CommandScheduler(radio).start()
+    scheduler.set_auto_info(True).result(timeout=2)
+    radio.ser.tune("7074000")
+    radio.ser.set_mode("03")
+    deadline = time.time() + 2
+    while len(frames) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    scheduler.stop()
+    assert frames == ["FA007074000;", "MD03;"]
+
+
+def test_idle_read_error_keeps_the_worker(ft):
+    class Unplugged(ft.SimulatedRadio):
+        broken = False
+
+        @property
+        def in_waiting(self):
+            if self.broken:
+                raise OSError("device disconnected")
+            return super().in_waiting
+
+    sim = Unplugged(latency=0.001)
+    errors = []
+    scheduler = ft.CommandScheduler(ft.Radio("SIM", ser=sim).open(), on_error=errors.append).start()
+    scheduler.set_auto_info(True).result(timeout=2)
+    sim.broken = True
+    time.sleep(0.2)
+    assert [str(e) for e in errors] == ["device disconnected"]
+    assert scheduler._thread.is_alive() and not scheduler.radio.auto_info
+    sim.broken = False
+    assert scheduler.frequency().result(timeout=2) == "14.250000"
+    scheduler.stop()
+
+
+def test_auto_information_does_not_stall_a_batch(ft, example):
+    class OneDrop(ft.SimulatedRadio):
+        dropped = False
+
+        def _send(self, reply):
+            if reply.startswith("EX005") and not self.dropped:
+                self.dropped = True
+                return
+            super()._send(reply)
+
+    sim = OneDrop(menus=example, latency=0.001)
+    sim.auto_info = True
+    stop = threading.Event()
+
+    def turn_dial():
+        freq = 14250000
+        while not stop.is_set():
+            freq += 100
+            sim.tune(str(freq))
+            time.sleep(0.02)
+
+    threading.Thread(target=turn_dial, daemon=True).start()
+    seen = []
+    start = time.time()
+    try:
+        got = ft.query_menus(sim, [f"{n:03d}" for n in range(1, 7)], timeout=0.2, unsolicited=seen.append)
+    finally:
+        stop.set()
+    assert time.time() - start < 2
+    assert got == {m: example[m] for m in got} and len(got) == 6
+    assert seen and all(frame.startswith("FA") for frame in seen)
@@ -0,0 +1,41 @@
+def raw_samples(ft, example):
+    for menu, info in ft.MENU_MAP.items():
+        yield menu, info['default']
+        yield menu, "9"
+        for raw in info.get('value_map') or ():
+            yield menu, raw
+    yield from example.items()
+    yield "999", "1"  # not in MENU_MAP
+
+
+def test_get_mapped_value_matches_the_original_lookup(ft, example):
+    for menu, raw in raw_samples(ft, example):
+        assert ft.get_mapped_value(menu, raw) == ft._decode_uncompiled(menu, raw)
+
+
+def test_decode_replies_skips_other_frames(ft):
+    results = ft.decode_replies(["EX0313;", "FA014250000;", "?;", "EX;", " EX0087 ;", "EX087G0lYb;"])
+    assert [(res.menu, res.raw, res.translated) for res in results] == [
+        ("031", "3", "38400"), ("008", "7", ft.decode_menu("008", "7").translated), ("087", "G0lYb", "G0lYb")]
+
+
+def test_decode_dump_file_reads_txt_and_csv(ft, example):
+    txt = ft.EXAMPLE_CSV[:-4] + ".txt"
+    from_csv = ft.decode_dump_file(ft.EXAMPLE_CSV)
+    assert {res.menu: res.raw for res in from_csv} == example
+    assert {res.menu: res.raw for res in ft.decode_dump_file(txt)} == ft.read_dump_txt(txt)
+    assert ft.format_line(from_csv[30]).startswith("Menu 031: 3 --> CAT RATE: 38400")
+
+
+def test_decode_cache_is_bounded(ft):
+    entry = ft.MENU_TABLE[1]
+    for n in range(ft.MENU_CACHE_SIZE + 50):
+        ft.decode_menu("001", str(n))
+    assert len(entry.results) == ft.MENU_CACHE_SIZE
+    assert ft.decode_menu("001", str(ft.MENU_CACHE_SIZE + 10)).raw == str(ft.MENU_CACHE_SIZE + 10)
+
+
+def test_benchmark_decode_reports_cold_and_warm(ft, capsys):
+    ft.benchmark_decode([ft.EXAMPLE_CSV], repeat=3)
+    out = capsys.readouterr().out
+    assert "first pass" in out and "2 repeats" in out
@@ -0,0 +1,43 @@
+import os
+
+
+def test_ordered_stream_emits_in_menu_order(ft):
+    emitted, missing = [], []
+    stream = ft.OrderedStream(['001', '002', '003', '004'], lambda m, raw: emitted.append(m), missing.append)
+    stream.feed('002', 'b')
+    assert emitted == []
+    stream.feed('001', 'a')
+    stream.feed('004', 'd')
+    assert emitted == ['001', '002']
+    stream.finish()
+    assert emitted == ['001', '002', '004']
+    assert missing == ['003']
+
+
+def test_dump_writes_every_format(ft, example, tmp_path):
+    radio = ft.Radio("SIM", ser=ft.SimulatedRadio(menus=example, latency=0.001))
+    paths = [str(tmp_path / name) for name in ("d.txt", "d.csv", "d.jsonl")]
+    with radio:
+        results = ft.MenuDumper(radio, log=lambda msg: None).dump(*paths)
+    assert len(results) == ft.MENU_COUNT
+    assert ft.read_dump_csv(paths[1]) == example
+    assert ft.read_dump_txt(paths[0]) == example
+    assert not any(name.endswith(".part") for name in os.listdir(tmp_path))
+
+
+def test_resume_after_interrupted_dump(ft, example, tmp_path):
+    txt, csv_path = str(tmp_path / "d.txt"), str(tmp_path / "d.csv")
+    writer = ft.DumpWriter(txt, csv_path)
+    for menu in sorted(example)[:40]:
+        writer.write(ft.decode_menu(menu, example[menu]))
+    writer.close(complete=False)
+    with open(csv_path + ".part", "a", encoding="utf-8") as f:
+        f.write("041,12")  # torn row
+
+    sim = ft.SimulatedRadio(menus=example, latency=0.001)
+    with ft.Radio("SIM", ser=sim) as radio:
+        results = ft.MenuDumper(radio, log=lambda msg: None).dump(txt, csv_path, resume=True)
+    assert sim.commands == ft.MENU_COUNT - 40
+    assert [res.menu for res in results] == sorted(example)
+    assert ft.read_dump_csv(csv_path) == example
+    assert not os.path.exists(csv_path + ".part")
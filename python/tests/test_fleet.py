@@ -0,0 +1,30 @@
+import os
+
+
+def test_one_failing_radio_does_not_stop_the_fleet(ft, example, tmp_path):
+    class Unplugged(ft.SimulatedRadio):
+        def write(self, data):
+            if self.commands > 20:
+                raise OSError("device disconnected")
+            return super().write(data)
+
+    radios = [
+        ("RIG1", ft.Radio("SIM1", ser=ft.SimulatedRadio(menus=example, latency=0.001))),
+        ("RIG2", ft.Radio("SIM2", ser=Unplugged(menus=example, latency=0.001))),
+        ("RIG3", ft.Radio("/dev/does-not-exist", timeout=0.05)),
+        ("RIG4", ft.Radio("SIM4", ser=ft.SimulatedRadio(menus=example, latency=0.001))),
+    ]
+    report = ft.dump_fleet(radios, max_workers=4, log=lambda msg: None, out_dir=str(tmp_path))
+    assert list(report) == sorted(radio.port for _, radio in radios)
+    by_label = {entry['radio']: entry for entry in report.values()}
+    assert by_label['RIG1']['ok'] and by_label['RIG4']['ok']
+    assert {m: res['raw'] for m, res in by_label['RIG1']['menus'].items()} == example
+    assert "OSError" in by_label['RIG2']['error']
+    assert "LinkError" in by_label['RIG3']['error']
+    assert sorted(os.listdir(tmp_path)) == ["RIG1.csv", "RIG4.csv"]
+    assert ft.read_dump_csv(str(tmp_path / "RIG4.csv")) == example
+
+
+def test_safe_name(ft):
+    assert ft.safe_name("/dev/ttyUSB0") == "_dev_ttyUSB0"
+    assert ft.safe_name("A1-B_2") == "A1-B_2"
@@ -0,0 +1,47 @@
+def test_record_counts_per_command_type(ft):
+    metrics = ft.CommandMetrics()
+    for n in range(10):
+        metrics.record('FA', written=3, read=14, first_byte=0.001 * (n + 1), done=0.002 * (n + 1))
+    metrics.record('FA', written=6, retries=1, timeout=True)
+    metrics.record('EX', read=2, error=True)
+    stats = metrics.to_json()
+    assert list(stats) == ['EX', 'FA']
+    fa = stats['FA']
+    assert (fa['commands'], fa['bytes_written'], fa['bytes_read'], fa['retries'], fa['timeouts'], fa['errors']) == \
+           (11, 36, 140, 1, 1, 0)
+    assert fa['first_byte'] == {'count': 10, 'sum': 0.055, 'p50': 0.005, 'p99': 0.01}
+    assert fa['terminator']['p99'] == 0.02
+    assert stats['EX']['errors'] == 1 and stats['EX']['first_byte']['p50'] is None
+    assert "FA: 11 cmds, 36 B out, 140 B in, first byte p50/p99 5.0/10.0 ms" in metrics.summary()
+    assert "EX: 1 cmds" in metrics.summary() and "p50/p99 -/- ms" in metrics.summary()
+
+
+def test_radio_records_real_commands(ft, example, menus):
+    with ft.Radio("SIM", ser=ft.SimulatedRadio(menus=example, latency=0.001)) as radio:
+        radio.metrics = ft.CommandMetrics()
+        radio.query_menus(menus[:20])
+        radio.frequency()
+        radio.set_auto_info(False)
+    stats = radio.metrics.to_json()
+    assert stats['EX']['commands'] == stats['EX']['terminator']['count'] == 20
+    assert 0 < stats['EX']['first_byte']['count'] < 20  # one per pipelined batch
+    assert stats['FA']['commands'] == 1 and stats['FA']['bytes_written'] == 3
+    assert stats['AI']['commands'] == 1 and stats['AI']['bytes_read'] == 0
+
+
+def test_format_prometheus(ft):
+    rig1, rig2 = ft.CommandMetrics(), ft.CommandMetrics()
+    rig1.record('EX', written=6, read=9, first_byte=0.004, done=0.005)
+    rig2.record('MD', written=4, timeout=True)
+    text = ft.format_prometheus({"RIG1": rig1, "RIG2": rig2})
+    lines = text.splitlines()
+    assert text.endswith("\n")
+    assert "# TYPE ft991a_cat_commands_total counter" in lines
+    assert 'ft991a_cat_bytes_read_total{radio="RIG1",command="EX"} 9' in lines
+    assert 'ft991a_cat_timeouts_total{radio="RIG2",command="MD"} 1' in lines
+    assert "# TYPE ft991a_cat_time_to_first_byte_seconds summary" in lines
+    assert 'ft991a_cat_time_to_first_byte_seconds{radio="RIG1",command="EX",quantile="0.50"} 0.004' in lines
+    assert 'ft991a_cat_time_to_terminator_seconds{radio="RIG1",command="EX",quantile="0.99"} 0.005' in lines
+    assert 'ft991a_cat_time_to_terminator_seconds_count{radio="RIG1",command="EX"} 1' in lines
+    assert 'ft991a_cat_time_to_first_byte_seconds_count{radio="RIG2",command="MD"} 0' in lines
+    assert not any('quantile' in line and 'RIG2' in line for line in lines)
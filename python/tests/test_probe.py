@@ -0,0 +1,24 @@
+import pytest
+
+
+def test_probe_keeps_an_explicit_timeout(ft):
+    radio = ft.Radio("SIM", timeout=2.0, ser=ft.SimulatedRadio(), auto_probe=True).open()
+    assert radio.timeout == 2.0
+    radio = ft.Radio("SIM", ser=ft.SimulatedRadio(), auto_probe=True).open()
+    assert radio.timeout <= ft.CMD_TIMEOUT
+
+
+def test_probe_succeeds_on_a_slow_link(ft):
+    radio = ft.Radio("SIM", ser=ft.SimulatedRadio(latency=0.3), auto_probe=True).open()
+    assert radio.link['baudrate'] == ft.BAUDRATE
+
+
+def test_probe_finds_the_cat_rate(ft):
+    link = ft.probe_link(ft.SimulatedRadio(baudrate=38400, cat_rate=4800), rates=(38400, 4800), ping_timeout=0.2)
+    assert link['baudrate'] == 4800
+    assert ft.MIN_CMD_TIMEOUT <= link['timeout'] <= 0.2
+
+
+def test_probe_reports_a_rate_mismatch(ft):
+    with pytest.raises(ft.LinkError, match="baud mismatch"):
+        ft.probe_link(ft.SimulatedRadio(cat_rate=4800), rates=(38400, 19200), ping_timeout=0.1)
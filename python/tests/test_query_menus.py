@@ -0,0 +1,32 @@
+def test_pipelined_matches_sequential(ft, example, menus):
+    pipelined = ft.query_menus(ft.SimulatedRadio(menus=example, latency=0.001), menus, timeout=0.1)
+    sequential = ft.query_menus_sequential(ft.SimulatedRadio(menus=example, latency=0.001), menus, 0.1,
+                                           debug=lambda msg: None)
+    assert pipelined == sequential == example
+
+
+def test_pipelined_requeries_dropped_replies(ft, example, menus):
+    sim = ft.SimulatedRadio(menus=example, latency=0.001, drop_rate=0.1, seed=1)
+    got = ft.query_menus(sim, menus, timeout=0.05, passes=5)
+    assert got == example
+
+
+def test_garbled_replies_are_never_stored(ft, example, menus):
+    menus = menus[:80]
+    for seed in range(2):
+        sim = ft.SimulatedRadio(menus=example, latency=0.001, garble_rate=0.2, seed=seed)
+        got = ft.query_menus(sim, menus, timeout=0.02, passes=5)
+        assert {m: v for m, v in got.items() if v != example[m]} == {}
+        assert len(got) > 70
+
+        sim = ft.SimulatedRadio(menus=example, latency=0.001, garble_rate=0.2, seed=seed)
+        got = ft.query_menus_sequential(sim, menus, 0.02, debug=lambda msg: None)
+        assert {m: v for m, v in got.items() if v != example[m]} == {}
+
+
+def test_valid_menu_value(ft):
+    assert ft.valid_menu_value('027', '-700')
+    assert ft.valid_menu_value('087', 'G0lYb')
+    assert not ft.valid_menu_value('027', '-70#')
+    assert not ft.valid_menu_value('040', 'X')
+    assert not ft.valid_menu_value('040', '')
@@ -0,0 +1,49 @@
+def restore(ft, sim, target, **options):
+    with ft.Radio("SIM", ser=sim) as radio:
+        return ft.restore_menus(radio, target, log=lambda msg: None, **options)
+
+
+def test_restore_writes_and_verifies(ft, example):
+    sim = ft.SimulatedRadio(menus=example, latency=0.001, factory_reset=True)
+    report = restore(ft, sim, example)
+    assert report['changed'] and not report['failed'] and not report['invalid']
+    assert {m: sim.menus[m] for m in example if m not in ft.LINK_MENUS and m != '087'} == \
+           {m: example[m] for m in example if m not in ft.LINK_MENUS and m != '087'}
+    assert restore(ft, ft.SimulatedRadio(menus=sim.menus, latency=0.001), example)['changed'] == []
+
+
+def test_restore_dry_run_writes_nothing(ft, example):
+    sim = ft.SimulatedRadio(menus=example, latency=0.001, factory_reset=True)
+    before = dict(sim.menus)
+    report = restore(ft, sim, example, dry_run=True)
+    assert report['changed'] and sim.menus == before
+
+
+def test_restore_reports_failed_verify(ft, example):
+    changed = restore(ft, ft.SimulatedRadio(menus=example, factory_reset=True), example, dry_run=True)['changed']
+    stuck = changed[0][0]
+
+    class Stuck(ft.SimulatedRadio):
+        def _answer(self, cmd):
+            if cmd.startswith(f"EX{stuck}") and len(cmd) > 5:
+                return None  # accepts the set but keeps the old value
+            return super()._answer(cmd)
+
+    report = restore(ft, Stuck(menus=example, latency=0.001, factory_reset=True), example)
+    assert report['failed'] == [stuck]
+    assert stuck not in [change[0] for change in report['changed']]
+
+
+def test_restore_lists_link_menus_apart(ft, example):
+    target = dict(example, **{'031': '2'})
+    sim = ft.SimulatedRadio(menus=example, latency=0.001)
+    report = restore(ft, sim, target, include_link=True)
+    assert [change[0] for change in report['link']] == ['031']
+    assert report['changed'] == [] and not report['failed']
+    assert sim.menus['031'] == '2'
+
+
+def test_restore_rejects_invalid_values(ft, example):
+    target = dict(example, **{'031': '7'})
+    report = restore(ft, ft.SimulatedRadio(menus=example), target)
+    assert [item[0] for item in report['invalid']] == ['031']
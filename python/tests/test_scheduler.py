@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+
+def test_status_polls_jump_ahead_of_menu_chunks(ft, example):
+    radio = ft.Radio("SIM", ser=ft.SimulatedRadio(menus=example, latency=0.001)).open()
+    scheduler = ft.CommandScheduler(radio).start()
+    gate = threading.Event()
+    order = []
+    scheduler.submit(lambda radio: gate.wait(2))  # hold the worker
+    chunks = [scheduler.submit(ft.Radio.query_menus, [f"{n:03d}"], callback=lambda f, n=n: order.append(n))
+              for n in range(1, 4)]
+    poll = scheduler.frequency(callback=lambda f: order.append("FA"))
+    gate.set()
+    assert poll.result(timeout=2) == "14.250000"
+    for chunk in chunks:
+        chunk.result(timeout=2)
+    assert order == ["FA", 1, 2, 3]
+    scheduler.stop()
+
+
+def test_dump_through_scheduler_keeps_growing_the_window(ft, example):
+    radio = ft.Radio("SIM", ser=ft.SimulatedRadio(menus=example, latency=0.001)).open()
+    scheduler = ft.CommandScheduler(radio).start()
+    results = ft.MenuDumper(radio, log=lambda msg: None, scheduler=scheduler).dump()
+    scheduler.stop()
+    assert {res.menu: res.raw for res in results} == example
+    assert radio.pacing['window'] > ft.SCHEDULER_CHUNK
+
+
+def test_fail_pending_fails_queued_jobs_and_keeps_stop(ft):
+    scheduler = ft.CommandScheduler(ft.Radio("SIM", ser=ft.SimulatedRadio()).open())
+    futures = [scheduler.frequency(), scheduler.mode()]
+    scheduler.stop()
+    cancelled = scheduler.submit(lambda radio: None)
+    cancelled.cancel()
+    scheduler._fail_pending(OSError("unplugged"))
+    for future in futures:
+        with pytest.raises(OSError):
+            future.result(timeout=0)
+    assert cancelled.cancelled()
+    scheduler.start()._thread.join(timeout=2)
+    assert not scheduler._thread.is_alive()  # the stop request survived
+
+
+def test_job_errors_resolve_their_future(ft):
+    scheduler = ft.CommandScheduler(ft.Radio("SIM", ser=ft.SimulatedRadio()).open()).start()
+
+    def broken(radio):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        scheduler.submit(broken).result(timeout=2)
+    assert scheduler.frequency().result(timeout=2) == "14.250000"
+    scheduler.stop()
@@ -0,0 +1,52 @@
+import time
+
+
+class DropFirst:
+    # Mixin: the first reply to each command prefix is lost
+    def _send(self, reply):
+        seen = self.__dict__.setdefault('seen', set())
+        if reply[:2] not in seen:
+            seen.add(reply[:2])
+            return
+        super()._send(reply)
+
+
+def test_reply_is_matched_by_prefix(ft):
+    sim = ft.SimulatedRadio(latency=0.001)
+    sim.auto_info = True
+    sim.tune("7074000")  # queued ahead of the MD reply
+    frames = []
+    assert ft.send_command(sim, "md", 0.2, unsolicited=frames.append) == "MD02;"
+    assert frames == ["FA007074000;"]
+
+
+def test_error_reply_is_returned(ft):
+    sim = ft.SimulatedRadio(latency=0.001)
+    assert ft.send_command(sim, "ZZ", 0.2) == "?;"
+
+
+def test_retries_after_a_dropped_reply(ft):
+    sim = type("Sim", (DropFirst, ft.SimulatedRadio), {})(latency=0.001)
+    metrics = ft.CommandMetrics()
+    assert ft.send_command(sim, "FA", 0.05, retries=1, metrics=metrics) == "FA014250000;"
+    assert sim.commands == 2
+    assert metrics.stats['FA']['retries'] == 1 and metrics.stats['FA']['timeouts'] == 0
+
+    sim = type("Sim", (DropFirst, ft.SimulatedRadio), {})(latency=0.001)
+    assert ft.send_command(sim, "FA", 0.05, retries=0) == ""
+
+
+def test_set_command_does_not_wait(ft):
+    sim = ft.SimulatedRadio(latency=0.001)
+    start = time.time()
+    assert ft.send_command(sim, "FA014000000", 0.5, reply=False) == ""
+    assert time.time() - start < 0.05
+    assert sim.freq == "014000000"
+
+
+def test_parse_helpers(ft):
+    assert ft.parse_frequency("FA014250000;") == "14.250000"
+    assert ft.parse_frequency("FAxyz;") == "Error"
+    assert ft.parse_frequency("") == "???"
+    assert ft.parse_mode("MD0A;") == "DATA-U (Data USB)"
+    assert ft.parse_mode("") == "???"
@@ -0,0 +1,59 @@
+import time
+
+
+def test_answers_queries_and_sets(ft, example):
+    sim = ft.SimulatedRadio(menus=example, latency=0.001)
+    sim.write(b"FA;MD;EX031;")
+    sim.timeout = 0.2
+    assert [sim.read_until(b";") for _ in range(3)] == [b"FA014250000;", b"MD02;", b"EX0313;"]
+    sim.write(b"FA007074000;EX0312;EX087ABCDE;EX03112;")
+    assert sim.read_until(b";") == b"?;"  # read-only menu
+    assert sim.read_until(b";") == b"?;"  # wrong width
+    assert (sim.freq, sim.menus['031'], sim.menus['087']) == ("007074000", "2", example['087'])
+
+
+def test_replies_are_paced_by_baud_rate(ft):
+    sim = ft.SimulatedRadio(baudrate=4800, latency=0.0)
+    sim.timeout = 1.0
+    start = time.time()
+    sim.write(b"FA;" * 10)
+    for _ in range(10):
+        sim.read_until(b";")
+    assert time.time() - start >= 10 * 12 * 10 / 4800 * 0.9
+
+
+def test_drop_and_garble_rates(ft, example):
+    sim = ft.SimulatedRadio(menus=example, latency=0.0, baudrate=1_000_000, drop_rate=0.3, garble_rate=0.3, seed=7)
+    sim.timeout = 0.05
+    sim.write(b"EX001;" * 500)
+    frames = []
+    while True:
+        frame = sim.read_until(b";")
+        if not frame:
+            break
+        frames.append(frame)
+    assert 250 < len(frames) < 450
+    garbled = [f for f in frames if f != f"EX001{example['001']};".encode()]
+    assert 0.15 < len(garbled) / len(frames) < 0.45
+    assert all(f.endswith(b";") for f in frames)
+
+
+def test_rate_mismatch_returns_noise(ft):
+    sim = ft.SimulatedRadio(baudrate=9600, cat_rate=38400)
+    sim.timeout = 0.1
+    sim.write(b"FA;")
+    assert not sim.read_until(b";").startswith(b"FA")
+
+
+def test_factory_reset_keeps_value_widths(ft, example):
+    sim = ft.SimulatedRadio(menus=example, factory_reset=True)
+    assert all(len(sim.menus[m]) == len(example[m]) for m in example)
+    assert sim.menus['007'] == ft.MENU_MAP['007']['default'] != example['007']
+    assert sim.menus['008'] == example['008']  # default '8' doesn't fit a 2-digit value
+
+
+def test_benchmark_reports_every_path(ft, capsys):
+    ft.benchmark(dump_iterations=1, poll_iterations=2, latency=0.001)
+    out = capsys.readouterr().out
+    for label in ("dump (sequential)", "dump (pipelined)", "dump (scheduled)", "get_frequency", "get_mode"):
+        assert label in out
@@ -0,0 +1,65 @@
+import pytest
+
+
+def run_dump(ft, tmp_path, capsys, *options):
+    status = ft.main(["dump", "--simulate", "--snapshot-dir", str(tmp_path / "snaps"),
+                      "--txt", str(tmp_path / "d.txt"), *options])
+    return status, capsys.readouterr().out
+
+
+def age_snapshot(ft, path, seconds, menus=None):
+    snapshot = ft.load_snapshot(path)
+    ft.save_snapshot(path, {m: (res, read_at - seconds if menus is None or m in menus else read_at)
+                            for m, (res, read_at) in snapshot.items()})
+
+
+def test_load_snapshot_skips_bad_read_at(ft, example, tmp_path):
+    path = str(tmp_path / "snap.csv")
+    now = 1_790_000_000.0
+    ft.save_snapshot(path, {m: (ft.decode_menu(m, raw), now) for m, raw in example.items()})
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    lines[5] = lines[5].rsplit(",", 1)[0] + ",garbage\n"
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    snapshot = ft.load_snapshot(path)
+    assert len(snapshot) == len(example) - 1
+    assert all(read_at == now for _, read_at in snapshot.values())
+
+
+def test_load_snapshot_requires_the_file(ft, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ft.load_snapshot(str(tmp_path / "missing.csv"))
+
+
+def test_diff_fails_on_a_missing_file(ft, tmp_path, capsys):
+    assert ft.main(["diff", str(tmp_path / "missing.csv")]) == 2
+    assert "No such file" in capsys.readouterr().out
+    assert ft.main(["diff", ft.EXAMPLE_CSV, str(tmp_path / "missing.csv")]) == 2
+    assert ft.main(["diff", ft.EXAMPLE_CSV]) == 0
+
+
+def test_incremental_rechecks_stale_menus(ft, tmp_path, capsys):
+    status, out = run_dump(ft, tmp_path, capsys, "--incremental")
+    assert status == 0 and f"Querying {ft.MENU_COUNT} of {ft.MENU_COUNT}" in out
+    status, out = run_dump(ft, tmp_path, capsys, "--incremental")
+    assert "Querying 0 of" in out
+
+    snap = str(tmp_path / "snaps" / "SIM.csv")
+    age_snapshot(ft, snap, ft.SNAPSHOT_MAX_AGE + 60, menus={'001', '002', '003'})
+    status, out = run_dump(ft, tmp_path, capsys, "--incremental")
+    assert "Querying 3 of" in out
+
+    age_snapshot(ft, snap, 2 * 3600)
+    status, out = run_dump(ft, tmp_path, capsys, "--max-age", "1")
+    assert f"Querying {ft.MENU_COUNT} of" in out
+
+
+def test_incremental_writes_jsonl_and_rejects_resume(ft, tmp_path, capsys):
+    jsonl = str(tmp_path / "d.jsonl")
+    status, out = run_dump(ft, tmp_path, capsys, "--incremental", "--jsonl", jsonl)
+    assert status == 0
+    with open(jsonl, encoding="utf-8") as f:
+        assert len(f.readlines()) == ft.MENU_COUNT
+    status, out = run_dump(ft, tmp_path, capsys, "--incremental", "--resume")
+    assert status == 2 and "--resume" in out